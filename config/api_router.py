@@ -5,6 +5,7 @@ from rest_framework.routers import SimpleRouter
 from gymlog.gym.api.views import ExerciseViewSet
 from gymlog.gym.api.views import RoutineViewSet
 from gymlog.gym.api.views import SetLogViewSet
+from gymlog.gym.api.views import StatsViewSet
 from gymlog.gym.api.views import WorkoutViewSet
 from gymlog.users.api.views import UserViewSet
 
@@ -14,8 +15,9 @@ router.register("users", UserViewSet)
 router.register(r"exercises", ExerciseViewSet, basename="exercise")
 router.register("workouts", WorkoutViewSet, basename="workout")
 router.register(r"routines", RoutineViewSet)
+router.register("stats", StatsViewSet, basename="stats")
 router.register(
-    r"workouts/(?P<workout_uuid>[^/.]+)/exercises/(?P<exercise_order>\d+)/sets",
+    r"workouts/(?P<workout_uuid>[0-9a-fA-F-]{36})/exercises/(?P<exercise_order>\d+)/sets",
     SetLogViewSet,
     basename="setlog",
 )
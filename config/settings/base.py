@@ -4,6 +4,7 @@
 from pathlib import Path
 
 import environ
+from celery.schedules import crontab
 from django.utils.translation import gettext_lazy as _
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
@@ -47,6 +48,22 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = False
+if env("DATABASE_REPLICA_URL", default=None):
+    DATABASES["replica"] = env.db("DATABASE_REPLICA_URL")
+# Each URL adds a shard_<n> alias. Gym data is placed on the shards by a hash
+# of the user's id, so changing their number needs the data to be moved.
+DATABASE_SHARDS = []
+for index, url in enumerate(env.list("DATABASE_SHARD_URLS", default=[])):
+    DATABASES[f"shard_{index}"] = env.db_url_config(url)
+    DATABASE_SHARDS.append(f"shard_{index}")
+DATABASE_ROUTERS = [
+    "gymlog.shards.UserShardRouter",
+    "gymlog.replicas.PrimaryReplicaRouter",
+]
+# Safe requests to these URLs may read from the replica.
+DATABASE_REPLICA_URLS_REGEX = r"^/api/"
+# How long a client reads from the primary after it writes.
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=10)
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -150,6 +167,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "gymlog.replicas.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -300,6 +318,17 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-schedule
+CELERY_BEAT_SCHEDULE = {
+    "flush-workout-drafts": {
+        "task": "gymlog.gym.tasks.flush_workout_drafts",
+        "schedule": env.int("WORKOUT_DRAFT_FLUSH_INTERVAL", default=60),
+    },
+    "rebuild-weekly-summaries": {
+        "task": "gymlog.gym.tasks.rebuild_weekly_summaries",
+        "schedule": crontab(minute=0, hour=3, day_of_week="monday"),
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
@@ -357,3 +386,22 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Seconds an autosaved workout draft is buffered in the cache before expiring.
+WORKOUT_DRAFT_TIMEOUT = env.int("WORKOUT_DRAFT_TIMEOUT", default=6 * 60 * 60)
+# How many past sessions of an exercise the progression rules look at.
+WORKOUT_PROGRESSION_SESSIONS = env.int("WORKOUT_PROGRESSION_SESSIONS", default=3)
+# Per exercise type overrides of gymlog.gym.suggestions.PROGRESSION_RULES.
+WORKOUT_PROGRESSION_RULES = {}
+# Workouts older than this many whole months are moved to compressed archives;
+# 0 turns archiving off. Archived workouts are only served by the history and
+# export endpoints and kept in the weekly summaries. Every other endpoint
+# stops seeing them, see gymlog.gym.archive.
+WORKOUT_ARCHIVE_AFTER_MONTHS = env.int("WORKOUT_ARCHIVE_AFTER_MONTHS", default=0)
+if WORKOUT_ARCHIVE_AFTER_MONTHS:
+    CELERY_BEAT_SCHEDULE["archive-workouts"] = {
+        "task": "gymlog.gym.tasks.archive_workouts",
+        "schedule": crontab(minute=0, hour=4, day_of_month=2),
+    }
+# Render workout list and detail responses in Postgres rather than through
+# WorkoutSerializer.
+WORKOUT_JSON_AGGREGATION = env.bool("WORKOUT_JSON_AGGREGATION", default=False)
@@ -22,7 +22,28 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# With DATABASE_POOL each worker keeps an in-process psycopg pool instead of
+# one persistent connection per thread, see gymlog/db/postgresql/base.py.
+DATABASE_POOL = env.bool("DATABASE_POOL", default=False)
+for database in DATABASES.values():
+    if DATABASE_POOL:
+        database["ENGINE"] = "gymlog.db.postgresql"
+        database["CONN_MAX_AGE"] = 0
+        database["CONN_HEALTH_CHECKS"] = True
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DATABASE_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DATABASE_POOL_MAX_SIZE", default=10),
+            # Seconds before surplus idle connections are closed.
+            "max_idle": env.float("DATABASE_POOL_MAX_IDLE", default=300.0),
+            # Seconds a request waits for a connection before failing.
+            "timeout": env.float("DATABASE_POOL_TIMEOUT", default=10.0),
+        }
+    else:
+        database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+    # PgBouncer in transaction mode can't keep a server-side cursor open across
+    # transactions; prepared statements are already disabled by default.
+    if env.bool("DATABASE_PGBOUNCER", default=False):
+        database["DISABLE_SERVER_SIDE_CURSORS"] = True
 
 # CACHES
 # ------------------------------------------------------------------------------
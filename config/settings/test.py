@@ -3,6 +3,7 @@ With these settings, tests run faster.
 """
 
 from .base import *  # noqa: F403
+from .base import DATABASES
 from .base import TEMPLATES
 from .base import env
 
@@ -16,6 +17,17 @@ SECRET_KEY = env(
 # https://docs.djangoproject.com/en/dev/ref/settings/#test-runner
 TEST_RUNNER = "django.test.runner.DiscoverRunner"
 
+# DATABASES
+# ------------------------------------------------------------------------------
+# Two shards with their own test databases. Routing to them stays off unless a
+# test sets DATABASE_SHARDS.
+for index in range(2):
+    DATABASES[f"shard_{index}"] = {
+        **DATABASES["default"],
+        "TEST": {"NAME": f"test_gymlog_shard_{index}"},
+    }
+DATABASE_SHARDS: list[str] = []
+
 # PASSWORDS
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
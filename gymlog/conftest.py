@@ -55,6 +55,7 @@ def exercise() -> Exercise:
 def workout(user: User) -> Workout:
     routine = Routine.objects.create(user=user, name="Test Routine")
     workout = Workout.objects.create(
+        user=user,
         routine=routine,
         duration="00:45:00",
         volume=100.0,
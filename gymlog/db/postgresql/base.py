@@ -0,0 +1,138 @@
+"""PostgreSQL backend with an optional in-process psycopg connection pool.
+
+Enable it with ``"ENGINE": "gymlog.db.postgresql"`` and an ``OPTIONS["pool"]``
+dict of ``psycopg_pool.ConnectionPool`` arguments (``min_size``,
+``max_size``, ``max_idle``, ``timeout``...). Each process opens its pool on
+first use, so pools are never shared across forked gunicorn workers. Closing
+a connection returns it to the pool, so ``CONN_MAX_AGE`` must be 0, and
+``CONN_HEALTH_CHECKS`` makes the pool check connections before handing them
+out. Prepared statements stay disabled, which keeps the pooled connections
+usable through PgBouncer in transaction mode.
+
+This mirrors the pooling built into Django 5.1 for the pinned 5.0.
+"""
+
+import logging
+from threading import Lock
+from time import perf_counter
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql.base import DatabaseWrapper as BaseDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+logger = logging.getLogger(__name__)
+
+# Waits longer than this are logged as they happen.
+SLOW_WAIT_SECONDS = 0.1
+
+_wait_lock = Lock()
+_waits = {}
+
+
+def _record_wait(alias, seconds) -> None:
+    with _wait_lock:
+        waits = _waits.setdefault(alias, {"count": 0, "total": 0.0, "max": 0.0})
+        waits["count"] += 1
+        waits["total"] += seconds
+        waits["max"] = max(waits["max"], seconds)
+    if seconds > SLOW_WAIT_SECONDS:
+        logger.warning("Waited %.0f ms for a %s connection", seconds * 1000, alias)
+
+
+class DatabaseWrapper(BaseDatabaseWrapper):
+    _connection_pools = {}
+
+    @property
+    def pool(self):
+        pool_options = self.settings_dict["OPTIONS"].get("pool")
+        # Database creation and other maintenance use their own connections.
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+
+        if self.alias not in self._connection_pools:
+            if self.settings_dict["CONN_MAX_AGE"] != 0:
+                msg = "Pooled connections can't also be persistent (CONN_MAX_AGE)."
+                raise ImproperlyConfigured(msg)
+            try:
+                from psycopg_pool import ConnectionPool
+            except ImportError as err:
+                msg = "Error loading psycopg_pool. Did you install psycopg[pool]?"
+                raise ImproperlyConfigured(msg) from err
+
+            conn_params = self.get_connection_params()
+            # Django switches autocommit off again where it needs to.
+            conn_params["autocommit"] = True
+            pool = ConnectionPool(
+                kwargs=conn_params,
+                name=self.alias,
+                # Opened in the process that uses it, after any fork.
+                open=False,
+                check=(
+                    ConnectionPool.check_connection
+                    if self.settings_dict["CONN_HEALTH_CHECKS"]
+                    else None
+                ),
+                **({} if pool_options is True else pool_options),
+            )
+            # The first thread to get here wins; losers' pools were never opened.
+            self._connection_pools.setdefault(self.alias, pool)
+        return self._connection_pools[self.alias]
+
+    def close_pool(self) -> None:
+        pool = self._connection_pools.pop(self.alias, None)
+        if pool is not None:
+            pool.close()
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        try:
+            self.isolation_level = IsolationLevel(
+                IsolationLevel.READ_COMMITTED
+                if isolation_level is None
+                else isolation_level,
+            )
+        except ValueError as err:
+            msg = f"Invalid transaction isolation level {isolation_level} specified."
+            raise ImproperlyConfigured(msg) from err
+
+        pool.open()
+        started = perf_counter()
+        connection = pool.getconn()
+        _record_wait(self.alias, perf_counter() - started)
+        if isolation_level is not None:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            self.pool.putconn(self.connection)
+            # The connection belongs to the pool again.
+            self.connection = None
+        return None
+
+
+def pool_stats() -> dict:
+    """Usage and wait-time statistics of every pool opened by this process."""
+    stats = {}
+    for alias, pool in DatabaseWrapper._connection_pools.items():  # noqa: SLF001
+        with _wait_lock:
+            waits = dict(_waits.get(alias, {"count": 0, "total": 0.0, "max": 0.0}))
+        stats[alias] = {
+            **pool.get_stats(),
+            "wait_count": waits["count"],
+            "wait_ms_total": round(waits["total"] * 1000, 3),
+            "wait_ms_max": round(waits["max"] * 1000, 3),
+        }
+    return stats
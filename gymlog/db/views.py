@@ -0,0 +1,14 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from gymlog.db.postgresql.base import pool_stats
+
+
+class DatabasePoolStatsView(APIView):
+    """Connection pool usage and wait times of the serving worker process."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(pool_stats())
@@ -4,11 +4,14 @@ from gymlog.mixins import GeneralModelAdmin
 
 from .models import Exercise
 from .models import ExerciseLog
+from .models import LastPerformance
 from .models import Routine
 from .models import RoutineExercise
 from .models import RoutineSet
 from .models import SetLog
+from .models import WeeklySummary
 from .models import Workout
+from .models import WorkoutArchive
 
 
 @admin.register(Exercise)
@@ -54,10 +57,10 @@ class RoutineSetAdmin(GeneralModelAdmin):
 
 @admin.register(Workout)
 class WorkoutAdmin(GeneralModelAdmin):
-    list_display = ("routine", "created", "end", "duration", "volume")
-    search_fields = ("routine__user__username", "routine__name")
+    list_display = ("user", "routine", "created", "end", "duration", "volume")
+    search_fields = ("user__username", "routine__name")
     list_filter = ("routine",)
-    list_select_related = ("routine__user", "routine")
+    list_select_related = ("user", "routine")
 
 
 @admin.register(ExerciseLog)
@@ -76,3 +79,26 @@ class SetLogAdmin(GeneralModelAdmin):
         "exercise_log__exercise__name",
     )
     list_select_related = ("exercise_log",)
+
+
+@admin.register(LastPerformance)
+class LastPerformanceAdmin(GeneralModelAdmin):
+    list_display = ("user", "exercise", "performed")
+    search_fields = ("user__username", "exercise__name")
+    list_select_related = ("user", "exercise")
+
+
+@admin.register(WeeklySummary)
+class WeeklySummaryAdmin(GeneralModelAdmin):
+    list_display = ("user", "week", "muscle_group", "sets", "reps", "volume")
+    search_fields = ("user__username",)
+    list_filter = ("muscle_group",)
+    list_select_related = ("user",)
+
+
+@admin.register(WorkoutArchive)
+class WorkoutArchiveAdmin(GeneralModelAdmin):
+    list_display = ("user", "month", "workouts")
+    search_fields = ("user__username",)
+    list_select_related = ("user",)
+    exclude = ("data",)
@@ -0,0 +1,185 @@
+"""Exercise substitutions ranked by a precomputed similarity matrix.
+
+Every exercise is encoded as a weighted feature vector over muscles,
+exercise type and equipment. The cosine similarity matrix of the whole
+catalog is computed with NumPy whenever the catalog changes, and the best
+matches of each exercise are cached, overall and for each equipment, so
+serving alternatives is a single cache read with no scoring. A request that
+misses the cache queues a rebuild and gets no alternatives meanwhile.
+"""
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from modeltranslation.utils import build_localized_fieldname
+from modeltranslation.utils import get_language
+
+from gymlog.gym.models import Exercise
+
+ALTERNATIVES_LIMIT = 50
+# Catalog edits move to a new cache version; this lets the old one expire.
+ALTERNATIVES_TIMEOUT = 60 * 60 * 24
+PRIMARY_MUSCLE_WEIGHT = 3.0
+OTHER_MUSCLE_WEIGHT = 1.0
+EXERCISE_TYPE_WEIGHT = 1.0
+# Low on purpose: swapping equipment is the usual reason to look.
+EQUIPMENT_WEIGHT = 0.5
+
+_VERSION_KEY = "gym:alternatives-version"
+_REBUILD_KEY = "gym:alternatives-rebuild"
+
+MUSCLES = list(Exercise.MuscleGroups.values)
+EXERCISE_TYPES = list(Exercise.ExerciseTypes.values)
+EQUIPMENTS = list(Exercise.Equipments.values)
+
+
+def _cache_key(exercise_id, equipment=None) -> str:
+    if equipment is None:
+        return f"gym:alternatives:{exercise_id}"
+    return f"gym:alternatives:{exercise_id}:{equipment}"
+
+
+def invalidate_alternatives() -> None:
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 1, None)
+
+
+def feature_matrix(exercises) -> np.ndarray:
+    """One row per ``(primary, other_muscles, exercise_type, equipment)``."""
+    type_offset = len(MUSCLES)
+    equipment_offset = type_offset + len(EXERCISE_TYPES)
+    features = np.zeros((len(exercises), equipment_offset + len(EQUIPMENTS)))
+    for row, (primary, other, exercise_type, equipment) in enumerate(exercises):
+        for muscle in other:
+            features[row, MUSCLES.index(muscle)] = OTHER_MUSCLE_WEIGHT
+        features[row, MUSCLES.index(primary)] = PRIMARY_MUSCLE_WEIGHT
+        column = type_offset + EXERCISE_TYPES.index(exercise_type)
+        features[row, column] = EXERCISE_TYPE_WEIGHT
+        if equipment:
+            column = equipment_offset + EQUIPMENTS.index(equipment)
+            features[row, column] = EQUIPMENT_WEIGHT
+    return features
+
+
+def similarity_matrix(features: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every pair of rows, with the diagonal zeroed."""
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    unit = np.divide(features, norms, out=np.zeros_like(features), where=norms > 0)
+    similarity = unit @ unit.T
+    np.fill_diagonal(similarity, 0.0)
+    return similarity
+
+
+def rank_alternatives(similarity: np.ndarray, limit: int) -> np.ndarray:
+    """Column indexes of the ``limit`` most similar rows, best first."""
+    limit = min(limit, similarity.shape[1] - 1)
+    if limit <= 0:
+        return np.empty((similarity.shape[0], 0), dtype=np.intp)
+    best = np.argpartition(-similarity, limit - 1, axis=1)[:, :limit]
+    order = np.argsort(-np.take_along_axis(similarity, best, axis=1), axis=1)
+    return np.take_along_axis(best, order, axis=1)
+
+
+def rebuild_alternatives() -> int:
+    """Score the whole catalog and cache the alternatives of every exercise."""
+    version = cache.get_or_set(_VERSION_KEY, 1, None)
+    name_fields = [
+        (code, build_localized_fieldname("name", code))
+        for code, _ in settings.LANGUAGES
+    ]
+    exercises = list(
+        Exercise.objects.order_by("pk").values(
+            "id",
+            "primary_muscle_group",
+            "other_muscles",
+            "exercise_type",
+            "equipment",
+            *(field for _, field in name_fields),
+        ),
+    )
+    similarity = similarity_matrix(
+        feature_matrix(
+            [
+                (
+                    e["primary_muscle_group"],
+                    e["other_muscles"],
+                    e["exercise_type"],
+                    e["equipment"],
+                )
+                for e in exercises
+            ],
+        ),
+    )
+
+    entries = [
+        {
+            "id": str(e["id"]),
+            "names": {code: e[field] for code, field in name_fields},
+            "primary_muscle_group": e["primary_muscle_group"],
+            "equipment": e["equipment"],
+        }
+        for e in exercises
+    ]
+    equipments = np.array([e["equipment"] for e in exercises], dtype=object)
+    alternatives = {}
+    for equipment in [None, *EQUIPMENTS]:
+        # Other equipment scores zero, so it is ranked last and left out.
+        scores = (
+            similarity
+            if equipment is None
+            else np.where(equipments == equipment, similarity, 0.0)
+        )
+        ranked = rank_alternatives(scores, ALTERNATIVES_LIMIT)
+        for row, exercise in enumerate(exercises):
+            alternatives[_cache_key(exercise["id"], equipment)] = [
+                {**entries[column], "similarity": float(scores[row, column])}
+                for column in ranked[row]
+                if scores[row, column] > 0
+            ]
+    cache.set_many(alternatives, ALTERNATIVES_TIMEOUT, version=version)
+    cache.delete(_REBUILD_KEY, version=version)
+    return len(exercises)
+
+
+def _queue_rebuild(version) -> None:
+    # tasks imports this module.
+    from gymlog.gym.tasks import rebuild_exercise_alternatives
+
+    # One queued rebuild per version; the lock outlives a stuck task.
+    timeout = settings.CELERY_TASK_TIME_LIMIT
+    if cache.add(_REBUILD_KEY, value=True, timeout=timeout, version=version):
+        rebuild_exercise_alternatives.delay()
+
+
+def _in_catalog(exercise_id) -> bool:
+    try:
+        return Exercise.objects.filter(pk=exercise_id).exists()
+    except ValidationError:
+        return False
+
+
+def get_alternatives(exercise_id, *, equipment=None, limit=10) -> list[dict] | None:
+    """Cached alternatives of an exercise, optionally for one equipment.
+
+    Returns ``None`` for exercises that are not in the catalog.
+    """
+    version = cache.get_or_set(_VERSION_KEY, 1, None)
+    key = _cache_key(exercise_id, equipment)
+    alternatives = cache.get(key, version=version)
+    if alternatives is None:
+        # Not built yet for this version, expired, or not an exercise at all.
+        if not _in_catalog(exercise_id):
+            return None
+        _queue_rebuild(version)
+        alternatives = cache.get(key, version=version, default=[])
+
+    language = get_language()
+    result = []
+    for alternative in alternatives[:limit]:
+        names = alternative["names"]
+        name = names.get(language) or names.get(settings.LANGUAGES[0][0])
+        result.append({**alternative, "name": name})
+    return result
@@ -0,0 +1,160 @@
+"""Progress analytics computed with NumPy over columnar set histories.
+
+Sets are fetched with one ``values_list`` query as ``(epoch, weight, reps)``
+rows ordered by workout, and every statistic is a vectorized pass over those
+columns instead of a Python loop over ``SetLog`` instances.
+"""
+
+from datetime import UTC
+from datetime import datetime
+
+import numpy as np
+from django.db.models import FloatField
+from django.db.models.functions import Extract
+
+from gymlog.gym.models import SetLog
+
+SECONDS_PER_DAY = 24 * 60 * 60
+# The Brzycki formula diverges at this many reps.
+BRZYCKI_MAX_REPS = 37
+MIN_TREND_POINTS = 2
+# Downsampling always keeps the first and last points plus one per bucket.
+MIN_DOWNSAMPLE_POINTS = 3
+
+EPLEY = "epley"
+BRZYCKI = "brzycki"
+FORMULAS = [EPLEY, BRZYCKI]
+
+
+def load_sets(user, exercise_id) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the user's sets of an exercise as ``(epoch, weight, reps)`` columns."""
+    rows = (
+        SetLog.objects.filter(
+            exercise_log__workout__user=user,
+            exercise_log__exercise_id=exercise_id,
+        )
+        .annotate(
+            epoch=Extract(
+                "exercise_log__workout__created",
+                "epoch",
+                output_field=FloatField(),
+            ),
+        )
+        .order_by("epoch")
+        .values_list("epoch", "weight", "reps")
+    )
+    columns = np.array(rows, dtype=np.float64).reshape(-1, 3)
+    return columns[:, 0], columns[:, 1], columns[:, 2]
+
+
+def estimated_one_rep_max(weight, reps, formula=EPLEY) -> np.ndarray:
+    """Estimated 1RM of every set; a single rep is its own 1RM."""
+    weight = np.asarray(weight, dtype=np.float64)
+    reps = np.asarray(reps, dtype=np.float64)
+    if formula == BRZYCKI:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            estimate = np.where(
+                reps < BRZYCKI_MAX_REPS,
+                weight * 36 / (BRZYCKI_MAX_REPS - reps),
+                np.nan,
+            )
+    else:
+        estimate = weight * (1 + reps / 30)
+    return np.where(reps == 1, weight, estimate)
+
+
+def rolling_sum(epoch, values, window_days) -> np.ndarray:
+    """Sum of ``values`` over the trailing ``window_days`` ending at each point."""
+    totals = np.concatenate(([0.0], np.cumsum(values)))
+    start = np.searchsorted(epoch, epoch - window_days * SECONDS_PER_DAY, side="right")
+    return totals[1:] - totals[start]
+
+
+def linear_trend(epoch, values) -> dict | None:
+    """Least-squares line through ``values``, with the slope per week."""
+    mask = ~np.isnan(values)
+    if np.count_nonzero(mask) < MIN_TREND_POINTS:
+        return None
+    days = (epoch[mask] - epoch[mask][0]) / SECONDS_PER_DAY
+    slope, intercept = np.polyfit(days, values[mask], 1)
+    return {"slope_per_week": float(slope * 7), "intercept": float(intercept)}
+
+
+def downsample(x, y, points) -> np.ndarray:
+    """Indices of at most ``points`` samples that keep the shape of ``y``.
+
+    Uses Largest-Triangle-Three-Buckets: the first and last samples are kept
+    and every bucket in between contributes the sample forming the largest
+    triangle with the previously kept sample and the next bucket's average.
+    The maximum of ``y`` always replaces its bucket's pick, so peaks survive.
+    """
+    size = len(x)
+    if points >= size or points < MIN_DOWNSAMPLE_POINTS:
+        return np.arange(size)
+
+    edges = np.linspace(1, size - 1, points - 1).astype(int)
+    selected = np.empty(points, dtype=int)
+    selected[0], selected[-1] = 0, size - 1
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_x = x[end : edges[bucket + 2]].mean()
+            next_y = y[end : edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        prev_x, prev_y = x[selected[bucket]], y[selected[bucket]]
+        area = np.abs(
+            (prev_x - next_x) * (y[start:end] - prev_y)
+            - (prev_x - x[start:end]) * (next_y - prev_y),
+        )
+        selected[bucket + 1] = start + np.argmax(area)
+
+    peak = np.argmax(y)
+    if 0 < peak < size - 1:
+        selected[np.searchsorted(edges, peak, side="right")] = peak
+    return selected
+
+
+def progress(sets, *, formula=EPLEY, window_days=28, points=None) -> dict:
+    """Per-workout best e1RM and volume, rolling volume and the e1RM trend.
+
+    ``sets`` are the ``(epoch, weight, reps)`` columns from ``load_sets``.
+    With ``points`` the series is downsampled to that many workouts; the
+    trend is still fitted on the full history.
+    """
+    epoch, weight, reps = sets
+    if not epoch.size:
+        return {"points": [], "trend": None}
+
+    # Sets are ordered by workout, so each workout is a contiguous run.
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(epoch)) + 1))
+    e1rm = estimated_one_rep_max(weight, reps, formula)
+    best = np.fmax.reduceat(e1rm, starts)
+    volume = np.add.reduceat(weight * reps, starts)
+    sessions = epoch[starts]
+    rolling_volume = rolling_sum(sessions, volume, window_days)
+    trend = linear_trend(sessions, best)
+
+    if points is not None:
+        keep = downsample(sessions, np.nan_to_num(best), points)
+        sessions, best = sessions[keep], best[keep]
+        volume, rolling_volume = volume[keep], rolling_volume[keep]
+
+    return {
+        "points": [
+            {
+                "date": datetime.fromtimestamp(moment, tz=UTC),
+                "e1rm": None if np.isnan(value) else float(value),
+                "volume": float(total),
+                "rolling_volume": float(rolling),
+            }
+            for moment, value, total, rolling in zip(
+                sessions.tolist(),
+                best.tolist(),
+                volume.tolist(),
+                rolling_volume.tolist(),
+                strict=True,
+            )
+        ],
+        "trend": trend,
+    }
@@ -1,14 +1,29 @@
-from django.db import transaction
+import operator
+from functools import reduce
+
+from django.db.models import F
+from django.db.models import Q
 from rest_framework import serializers
 from rest_framework.fields import MultipleChoiceField
 
+from gymlog import shards
+from gymlog.gym.alternatives import ALTERNATIVES_LIMIT
+from gymlog.gym.analytics import EPLEY
+from gymlog.gym.analytics import FORMULAS
+from gymlog.gym.analytics import MIN_DOWNSAMPLE_POINTS
 from gymlog.gym.models import Exercise
 from gymlog.gym.models import ExerciseLog
 from gymlog.gym.models import Routine
 from gymlog.gym.models import RoutineExercise
 from gymlog.gym.models import RoutineSet
 from gymlog.gym.models import SetLog
+from gymlog.gym.models import WeeklySummary
 from gymlog.gym.models import Workout
+from gymlog.gym.performances import get_last_performances
+from gymlog.gym.performances import update_last_performances
+from gymlog.gym.suggestions import invalidate_suggestions
+from gymlog.gym.summaries import refresh_workout_week
+from gymlog.gym.training_calendar import invalidate_calendar
 
 
 class ExerciseListSerializer(serializers.ModelSerializer):
@@ -38,12 +53,112 @@ class ExerciseDetailSerializer(serializers.ModelSerializer):
 
 
 class SetLogSerializer(serializers.ModelSerializer):
+    # Derived from the UUIDv7 key rather than stored.
+    created = serializers.DateTimeField(read_only=True)
+
     class Meta:
         model = SetLog
         fields = ["id", "created", "modified", "order", "weight", "reps", "end"]
 
+    def validate_order(self, value):
+        # Set by SetLogViewSet; nested writes replace all sets of a log.
+        exercise_log = self.context.get("exercise_log")
+        if exercise_log is None:
+            return value
+        taken = exercise_log.set_logs.filter(
+            performed=exercise_log.performed,
+            order=value,
+        )
+        if self.instance is not None:
+            taken = taken.exclude(pk=self.instance.pk)
+        if taken.exists():
+            msg = "A set with this order already exists."
+            raise serializers.ValidationError(msg)
+        return value
+
+
+class SetLogBatchListSerializer(serializers.ListSerializer):
+    def validate(self, attrs):
+        keys = [(item["exercise_order"], item["order"]) for item in attrs]
+        if len(keys) != len(set(keys)):
+            msg = "Each set may appear only once per batch."
+            raise serializers.ValidationError(msg)
+
+        exercise_log_ids = dict(
+            self.context["workout"]
+            .exercise_logs.filter(order__in={order for order, _ in keys})
+            .values_list("order", "id"),
+        )
+        missing = sorted({order for order, _ in keys} - exercise_log_ids.keys())
+        if missing:
+            msg = f"Unknown exercise orders: {missing}."
+            raise serializers.ValidationError(msg)
+
+        for item in attrs:
+            item["exercise_log_id"] = exercise_log_ids[item.pop("exercise_order")]
+            item["performed"] = self.context["workout"].created
+        return attrs
+
+    @shards.atomic
+    def create(self, validated_data):
+        # An INSERT ... ON CONFLICT statement appends new sets and overwrites
+        # existing ones matched by (exercise_log, order). ``end`` is optional,
+        # so sets sent without it get their own statement that keeps the
+        # recorded end time.
+        for with_end in (True, False):
+            items = [item for item in validated_data if ("end" in item) is with_end]
+            if not items:
+                continue
+            SetLog.objects.bulk_create(
+                [SetLog(**item) for item in items],
+                update_conflicts=True,
+                unique_fields=["exercise_log", "performed", "order"],
+                update_fields=["weight", "reps", "modified"]
+                + (["end"] if with_end else []),
+            )
+        # Overwritten rows keep their original primary key, so the result is
+        # selected by the natural key rather than by the instances above.
+        # ``performed`` prunes both log tables to the workout's partition.
+        performed = self.context["workout"].created
+        natural_keys = reduce(
+            operator.or_,
+            (
+                Q(exercise_log_id=item["exercise_log_id"], order=item["order"])
+                for item in validated_data
+            ),
+        )
+        return (
+            SetLog.objects.filter(
+                natural_keys,
+                performed=performed,
+                exercise_log__performed=performed,
+            )
+            .annotate(exercise_order=F("exercise_log__order"))
+            .order_by("exercise_order", "order")
+        )
+
+
+class SetLogBatchSerializer(serializers.ModelSerializer):
+    created = serializers.DateTimeField(read_only=True)
+    exercise_order = serializers.IntegerField(min_value=0)
+
+    class Meta:
+        model = SetLog
+        list_serializer_class = SetLogBatchListSerializer
+        fields = [
+            "id",
+            "created",
+            "modified",
+            "exercise_order",
+            "order",
+            "weight",
+            "reps",
+            "end",
+        ]
+
 
 class ExerciseLogSerializer(serializers.ModelSerializer):
+    created = serializers.DateTimeField(read_only=True)
     set_logs = SetLogSerializer(many=True)
     exercise_id = serializers.UUIDField()
 
@@ -63,6 +178,8 @@ class WorkoutSerializer(serializers.ModelSerializer):
         "end": null,
         "duration": "01:30:00",
         "volume": 300.0,
+        "averageRest": "00:01:45",
+        "density": 171.4,
         "routineId": "0190e5af-3cc2-7293-b925-ea9fa315c6db",
         "exerciseLogs": [
             {
@@ -108,11 +225,14 @@ class WorkoutSerializer(serializers.ModelSerializer):
             "end",
             "duration",
             "volume",
+            "average_rest",
+            "density",
             "routine_id",
             "exercise_logs",
         ]
+        read_only_fields = ["average_rest", "density"]
 
-    @transaction.atomic
+    @shards.atomic
     def update(self, workout: Workout, validated_data):
         new_exercise_logs = validated_data.pop("exercise_logs", [])
         routine_id = validated_data.pop("routine_id", None)
@@ -134,6 +254,10 @@ class WorkoutSerializer(serializers.ModelSerializer):
             for set_log_data in new_set_logs:
                 SetLog.objects.create(exercise_log=exercise_log, **set_log_data)
 
+        update_last_performances(workout)
+        refresh_workout_week(workout)
+        invalidate_calendar(workout.user_id)
+        invalidate_suggestions(workout.user_id)
         return workout
 
 
@@ -147,6 +271,7 @@ class RoutineExerciseSerializer(serializers.ModelSerializer):
     routine_sets = RoutineSetSerializer(many=True)
     exercise = ExerciseDetailSerializer(read_only=True)
     exercise_id = serializers.UUIDField()
+    last_performance = serializers.SerializerMethodField()
 
     class Meta:
         model = RoutineExercise
@@ -158,8 +283,12 @@ class RoutineExerciseSerializer(serializers.ModelSerializer):
             "rest_timer",
             "note",
             "routine_sets",
+            "last_performance",
         ]
 
+    def get_last_performance(self, obj):
+        return self.context.get("last_performances", {}).get(obj.exercise_id)
+
 
 class RoutineListSerializer(serializers.ModelSerializer):
     exercises_txt = serializers.SerializerMethodField()
@@ -195,7 +324,11 @@ class RoutineDetailSerializer(serializers.ModelSerializer):
                             "weight": 87.5,
                             "reps": 9
                         }
-                    ]
+                    ],
+                    "lastPerformance": {
+                        "performed": "2024-07-24T16:59:45.328608Z",
+                        "sets": [{"order": 1, "weight": 85.0, "reps": 10}]
+                    }
                 }
             ]
         }
@@ -205,7 +338,15 @@ class RoutineDetailSerializer(serializers.ModelSerializer):
         model = Routine
         fields = ["id", "name", "routine_exercises"]
 
-    @transaction.atomic
+    def to_representation(self, instance):
+        # One batched lookup for the hints of every exercise in the routine.
+        self.context["last_performances"] = get_last_performances(
+            instance.user_id,
+            instance.routine_exercises.values_list("exercise_id", flat=True),
+        )
+        return super().to_representation(instance)
+
+    @shards.atomic
     def create(self, validated_data):
         new_routine_exercises = validated_data.pop("routine_exercises")
         user = self.context["request"].user
@@ -225,7 +366,7 @@ class RoutineDetailSerializer(serializers.ModelSerializer):
 
         return routine
 
-    @transaction.atomic
+    @shards.atomic
     def update(self, instance, validated_data):
         new_routine_exercises = validated_data.pop("routine_exercises")
 
@@ -248,3 +389,139 @@ class RoutineDetailSerializer(serializers.ModelSerializer):
                 )
 
         return instance
+
+
+class RoutineDuplicateSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255, required=False)
+
+
+class RoutineGenerateSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    muscles = MultipleChoiceField(choices=Exercise.MuscleGroups.choices)
+    equipment = MultipleChoiceField(
+        choices=Exercise.Equipments.choices,
+        allow_empty=True,
+        required=False,
+        default=set,
+    )
+    duration = serializers.IntegerField(min_value=1, max_value=240)
+
+
+class RoutineExerciseOrderSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    routine_sets = serializers.ListField(child=serializers.UUIDField(), required=False)
+
+
+class RoutineReorderSerializer(serializers.Serializer):
+    routine_exercises = RoutineExerciseOrderSerializer(many=True)
+
+    def validate_routine_exercises(self, value):
+        routine = self.context["routine"]
+        routine_set_ids = {}
+        for routine_exercise_id, routine_set_id in RoutineExercise.objects.filter(
+            routine=routine,
+        ).values_list("id", "routine_sets__id"):
+            routine_set_ids.setdefault(routine_exercise_id, set())
+            if routine_set_id is not None:
+                routine_set_ids[routine_exercise_id].add(routine_set_id)
+
+        ids = [item["id"] for item in value]
+        if len(ids) != len(routine_set_ids) or set(ids) != routine_set_ids.keys():
+            msg = "List every exercise of the routine exactly once."
+            raise serializers.ValidationError(msg)
+
+        for item in value:
+            if "routine_sets" not in item:
+                continue
+            sets = item["routine_sets"]
+            if len(sets) != len(set(sets)) or set(sets) != routine_set_ids[item["id"]]:
+                msg = "List every set of the exercise exactly once."
+                raise serializers.ValidationError(msg)
+        return value
+
+
+class DateRangeSerializer(serializers.Serializer):
+    def get_fields(self):
+        # "from" is a keyword, so the fields cannot be declared as attributes.
+        return {
+            "from": serializers.DateField(required=False),
+            "to": serializers.DateField(required=False),
+        }
+
+
+class WeeklySummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WeeklySummary
+        fields = ["week", "muscle_group", "sets", "reps", "volume"]
+
+
+class ProgressQuerySerializer(serializers.Serializer):
+    exercise = serializers.UUIDField()
+    formula = serializers.ChoiceField(choices=FORMULAS, default=EPLEY)
+    window = serializers.IntegerField(min_value=1, default=28)
+    points = serializers.IntegerField(
+        min_value=MIN_DOWNSAMPLE_POINTS,
+        required=False,
+    )
+
+
+class RestStatisticsRowSerializer(serializers.Serializer):
+    key = serializers.CharField()
+    sets = serializers.IntegerField()
+    average_rest = serializers.DurationField(allow_null=True)
+    median_rest = serializers.DurationField(allow_null=True)
+    longest_rest = serializers.DurationField(allow_null=True)
+    density = serializers.FloatField(allow_null=True)
+
+
+class RestStatisticsSerializer(serializers.Serializer):
+    workouts = RestStatisticsRowSerializer(many=True)
+    exercises = RestStatisticsRowSerializer(many=True)
+    weeks = RestStatisticsRowSerializer(many=True)
+
+
+class TrainingDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    workouts = serializers.IntegerField()
+    volume = serializers.FloatField(allow_null=True)
+
+
+class TrainingCalendarSerializer(serializers.Serializer):
+    days = TrainingDaySerializer(many=True)
+    current_streak = serializers.IntegerField()
+    longest_streak = serializers.IntegerField()
+
+
+class ExerciseComparisonSerializer(serializers.Serializer):
+    exercise_id = serializers.UUIDField()
+    sets = serializers.IntegerField()
+    previous_sets = serializers.IntegerField()
+    sets_delta = serializers.IntegerField()
+    volume = serializers.FloatField()
+    previous_volume = serializers.FloatField()
+    volume_delta = serializers.FloatField()
+
+
+class WorkoutComparisonSerializer(serializers.Serializer):
+    previous = serializers.PrimaryKeyRelatedField(read_only=True)
+    exercises = ExerciseComparisonSerializer(many=True)
+
+
+class AlternativesQuerySerializer(serializers.Serializer):
+    equipment = serializers.ChoiceField(
+        choices=Exercise.Equipments.choices,
+        required=False,
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=ALTERNATIVES_LIMIT,
+        default=10,
+    )
+
+
+class ExerciseAlternativeSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    primary_muscle_group = serializers.CharField()
+    equipment = serializers.CharField()
+    similarity = serializers.FloatField()
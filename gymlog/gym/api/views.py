@@ -1,17 +1,64 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.http import HttpResponse
+from rest_framework import status
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from gymlog.gym import analytics
+from gymlog.gym.alternatives import get_alternatives
+from gymlog.gym.api.serializers import AlternativesQuerySerializer
+from gymlog.gym.api.serializers import DateRangeSerializer
+from gymlog.gym.api.serializers import ExerciseAlternativeSerializer
 from gymlog.gym.api.serializers import ExerciseDetailSerializer
 from gymlog.gym.api.serializers import ExerciseListSerializer
+from gymlog.gym.api.serializers import ProgressQuerySerializer
+from gymlog.gym.api.serializers import RestStatisticsSerializer
 from gymlog.gym.api.serializers import RoutineDetailSerializer
+from gymlog.gym.api.serializers import RoutineDuplicateSerializer
+from gymlog.gym.api.serializers import RoutineGenerateSerializer
 from gymlog.gym.api.serializers import RoutineListSerializer
+from gymlog.gym.api.serializers import RoutineReorderSerializer
+from gymlog.gym.api.serializers import SetLogBatchSerializer
 from gymlog.gym.api.serializers import SetLogSerializer
+from gymlog.gym.api.serializers import TrainingCalendarSerializer
+from gymlog.gym.api.serializers import WeeklySummarySerializer
+from gymlog.gym.api.serializers import WorkoutComparisonSerializer
 from gymlog.gym.api.serializers import WorkoutSerializer
+from gymlog.gym.archive import workout_history
+from gymlog.gym.comparisons import compare_workouts
+from gymlog.gym.drafts import discard_draft
+from gymlog.gym.drafts import flush_draft
+from gymlog.gym.drafts import get_draft
+from gymlog.gym.drafts import save_draft
+from gymlog.gym.generator import generate_routine
 from gymlog.gym.models import Exercise
+from gymlog.gym.models import ExerciseLog
 from gymlog.gym.models import Routine
 from gymlog.gym.models import SetLog
+from gymlog.gym.models import WeeklySummary
 from gymlog.gym.models import Workout
+from gymlog.gym.performances import forget_last_performances
+from gymlog.gym.performances import update_last_performances
+from gymlog.gym.routines import duplicate_routine
+from gymlog.gym.routines import reorder_routine
+from gymlog.gym.routines import start_workout
+from gymlog.gym.suggestions import invalidate_suggestions
+from gymlog.gym.suggestions import suggest_workout
+from gymlog.gym.summaries import refresh_workout_week
+from gymlog.gym.summaries import refresh_workout_week_on_commit
+from gymlog.gym.timing import finish_workout
+from gymlog.gym.timing import rest_statistics
+from gymlog.gym.training_calendar import invalidate_calendar
+from gymlog.gym.training_calendar import training_calendar
+from gymlog.gym.workout_json import workout_json
+from gymlog.gym.workout_json import workout_list_json
+from gymlog.shards import UserShardMixin
 
 
 class ExerciseViewSet(viewsets.ModelViewSet):
@@ -21,17 +68,67 @@ class ExerciseViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action == "list":
             return ExerciseListSerializer
+        if self.action == "alternatives":
+            return ExerciseAlternativeSerializer
         return ExerciseDetailSerializer
 
+    @action(detail=True)
+    def alternatives(self, request, *args, **kwargs):
+        query = AlternativesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        alternatives = get_alternatives(
+            kwargs["pk"],
+            equipment=query.validated_data.get("equipment"),
+            limit=query.validated_data["limit"],
+        )
+        if alternatives is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(alternatives, many=True).data)
+
 
-class WorkoutViewSet(viewsets.ModelViewSet):
+class WorkoutViewSet(UserShardMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = WorkoutSerializer
 
     def get_queryset(self):
-        return Workout.objects.filter(routine__user=self.request.user)
+        return Workout.objects.filter(user=self.request.user)
+
+    def get_date_range(self):
+        serializer = DateRangeSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+        invalidate_calendar(self.request.user.id)
+        invalidate_suggestions(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        forget_last_performances(instance)
+        instance.delete()
+        refresh_workout_week(instance)
+        invalidate_calendar(instance.user_id)
+        invalidate_suggestions(instance.user_id)
+
+    def list(self, request, *args, **kwargs):
+        if not settings.WORKOUT_JSON_AGGREGATION:
+            return super().list(request, *args, **kwargs)
+        workouts = self.filter_queryset(self.get_queryset())
+        return HttpResponse(
+            workout_list_json(workouts),
+            content_type="application/json",
+        )
 
     def retrieve(self, request, *args, **kwargs):
+        if settings.WORKOUT_JSON_AGGREGATION:
+            try:
+                workouts = self.get_queryset().filter(pk=kwargs["pk"])
+            except (DjangoValidationError, ValueError) as error:
+                raise Http404 from error
+            document = workout_json(workouts)
+            if document is None:
+                raise Http404
+            return HttpResponse(document, content_type="application/json")
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -41,18 +138,153 @@ class WorkoutViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance, data=request.data)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
+        # A full save supersedes whatever autosave is still buffered.
+        discard_draft(instance)
         return Response(serializer.data)
 
+    @action(detail=False, serializer_class=TrainingCalendarSerializer)
+    def calendar(self, request, *args, **kwargs):
+        date_range = self.get_date_range()
+        calendar = training_calendar(
+            request.user.id,
+            start=date_range.get("from"),
+            end=date_range.get("to"),
+        )
+        return Response(self.get_serializer(calendar).data)
+
+    @action(detail=False)
+    def history(self, request, *args, **kwargs):
+        date_range = self.get_date_range()
+        history = workout_history(
+            request.user.id,
+            start=date_range.get("from"),
+            end=date_range.get("to"),
+            context=self.get_serializer_context(),
+        )
+        return Response(history)
+
+    @action(detail=False)
+    def export(self, request, *args, **kwargs):
+        history = workout_history(
+            request.user.id,
+            context=self.get_serializer_context(),
+        )
+        return Response(
+            history,
+            headers={"Content-Disposition": 'attachment; filename="workouts.json"'},
+        )
+
+    @action(detail=True, serializer_class=WorkoutComparisonSerializer)
+    def compare(self, request, *args, **kwargs):
+        comparison = compare_workouts(self.get_object())
+        return Response(self.get_serializer(comparison).data)
 
-class SetLogViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["get", "put"])
+    def draft(self, request, *args, **kwargs):
+        workout = self.get_object()
+        if request.method == "GET":
+            data = get_draft(workout)
+            if data is None:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            return Response(data)
+
+        serializer = self.get_serializer(workout, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        revision = save_draft(workout, request.data)
+        return Response({"revision": revision}, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["post"])
+    def finish(self, request, *args, **kwargs):
+        workout = self.get_object()
+        if not flush_draft(workout):
+            update_last_performances(workout)
+            refresh_workout_week(workout)
+        discard_draft(workout)
+        finish_workout(workout)
+        return Response(self.get_serializer(workout).data)
+
+    @action(detail=True, methods=["post"], serializer_class=SetLogBatchSerializer)
+    def sets(self, request, *args, **kwargs):
+        workout = self.get_object()
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            context={**self.get_serializer_context(), "workout": workout},
+        )
+        serializer.is_valid(raise_exception=True)
+        set_logs = serializer.save()
+        # The buffered autosave predates these sets and would replace them.
+        discard_draft(workout)
+        refresh_workout_week_on_commit(workout)
+        invalidate_suggestions(workout.user_id)
+        return Response(
+            self.get_serializer(set_logs, many=True).data,
+            status=status.HTTP_200_OK,
+        )
+
+
+class SetLogViewSet(UserShardMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = SetLogSerializer
+    lookup_field = "order"
+    lookup_value_regex = r"\d+"
+
+    def get_workout(self):
+        if not hasattr(self, "_workout"):
+            self._workout = get_object_or_404(
+                Workout.objects.only("user_id", "created"),
+                pk=self.kwargs["workout_uuid"],
+                user=self.request.user,
+            )
+        return self._workout
 
     def get_queryset(self):
+        # ``performed`` of the logs is the workout's creation time. Matching on
+        # it prunes the log partitions to one month, and the lookups resolve
+        # through the partition-aware unique indexes of both log tables
+        # instead of scanning the user's whole set history.
+        workout = self.get_workout()
         return SetLog.objects.filter(
-            exercise_log__workout__routine__user=self.request.user,
+            exercise_log__workout=workout,
+            exercise_log__performed=workout.created,
+            exercise_log__order=self.kwargs["exercise_order"],
+            performed=workout.created,
         )
 
+    def get_exercise_log(self):
+        workout = self.get_workout()
+        return get_object_or_404(
+            ExerciseLog,
+            workout=workout,
+            performed=workout.created,
+            order=self.kwargs["exercise_order"],
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ("create", "update", "partial_update"):
+            context["exercise_log"] = self.get_exercise_log()
+        return context
+
+    def perform_create(self, serializer):
+        serializer.save(exercise_log=serializer.context["exercise_log"])
+        discard_draft(self.get_workout())
+        refresh_workout_week_on_commit(self.get_workout())
+        invalidate_suggestions(self.request.user.id)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        discard_draft(self.get_workout())
+        refresh_workout_week_on_commit(self.get_workout())
+        invalidate_suggestions(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        discard_draft(self.get_workout())
+        refresh_workout_week_on_commit(self.get_workout())
+        invalidate_suggestions(self.request.user.id)
+
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=True)
@@ -61,7 +293,7 @@ class SetLogViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class RoutineViewSet(viewsets.ModelViewSet):
+class RoutineViewSet(UserShardMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = Routine.objects.all()
 
@@ -77,4 +309,120 @@ class RoutineViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action == "list":
             return RoutineListSerializer
+        if self.action == "start":
+            return WorkoutSerializer
+        if self.action == "duplicate":
+            return RoutineDuplicateSerializer
+        if self.action == "generate":
+            return RoutineGenerateSerializer
+        if self.action == "reorder":
+            return RoutineReorderSerializer
         return RoutineDetailSerializer
+
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_suggestions(self.request.user.id)
+
+    @action(detail=True, methods=["post"])
+    def start(self, request, *args, **kwargs):
+        workout = start_workout(self.get_object())
+        refresh_workout_week_on_commit(workout)
+        invalidate_calendar(workout.user_id)
+        invalidate_suggestions(workout.user_id)
+        serializer = self.get_serializer(workout)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["post"])
+    def duplicate(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        routine = duplicate_routine(self.get_object(), **serializer.validated_data)
+        return Response(
+            RoutineDetailSerializer(
+                routine,
+                context=self.get_serializer_context(),
+            ).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["post"])
+    def generate(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        routine = generate_routine(request.user, **serializer.validated_data)
+        if routine is None:
+            msg = "No exercises match these muscles and equipment."
+            raise ValidationError({"muscles": [msg]})
+        return Response(
+            RoutineDetailSerializer(
+                routine,
+                context=self.get_serializer_context(),
+            ).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=True)
+    def suggestions(self, request, *args, **kwargs):
+        return Response(suggest_workout(self.get_object()))
+
+    @action(detail=True, methods=["post"])
+    def reorder(self, request, *args, **kwargs):
+        routine = self.get_object()
+        serializer = self.get_serializer(
+            data=request.data,
+            context={**self.get_serializer_context(), "routine": routine},
+        )
+        serializer.is_valid(raise_exception=True)
+        reorder_routine(routine, serializer.validated_data["routine_exercises"])
+        invalidate_suggestions(routine.user_id)
+        return Response(
+            RoutineDetailSerializer(
+                routine,
+                context=self.get_serializer_context(),
+            ).data,
+        )
+
+
+class StatsViewSet(UserShardMixin, viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticated]
+
+    def get_date_range(self):
+        serializer = DateRangeSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    @action(detail=False, serializer_class=WeeklySummarySerializer)
+    def weekly(self, request, *args, **kwargs):
+        date_range = self.get_date_range()
+        summaries = WeeklySummary.objects.filter(user=request.user)
+        if "from" in date_range:
+            summaries = summaries.filter(week__gte=date_range["from"])
+        if "to" in date_range:
+            summaries = summaries.filter(week__lte=date_range["to"])
+        serializer = self.get_serializer(summaries, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, serializer_class=RestStatisticsSerializer)
+    def rest(self, request, *args, **kwargs):
+        date_range = self.get_date_range()
+        statistics = rest_statistics(
+            request.user.id,
+            start=date_range.get("from"),
+            end=date_range.get("to"),
+        )
+        return Response(self.get_serializer(statistics).data)
+
+    @action(detail=False)
+    def progress(self, request, *args, **kwargs):
+        serializer = ProgressQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        sets = analytics.load_sets(request.user, params["exercise"])
+        return Response(
+            analytics.progress(
+                sets,
+                formula=params["formula"],
+                window_days=params["window"],
+                points=params.get("points"),
+            ),
+        )
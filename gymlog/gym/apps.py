@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GymConfig(AppConfig):
     default_auto_field = "django.db.models.UUIDField"
     name = "gymlog.gym"
+
+    def ready(self):
+        from gymlog.gym import signals  # noqa: F401
@@ -0,0 +1,134 @@
+"""Cold storage for old training history.
+
+Off unless ``WORKOUT_ARCHIVE_AFTER_MONTHS`` is set. Workouts older than that
+are serialized with ``WorkoutSerializer``, compressed into one
+``WorkoutArchive`` per user and month, and deleted from the log tables.
+Weekly summaries and last-performance hints are left in place.
+``workout_history`` reads archived months back in, so the history and export
+endpoints return the same payloads as before.
+
+Everything else reads the log tables only. Once a month is archived, the
+workout list and detail, progress, the calendar and streaks, comparisons,
+rest statistics and progression suggestions no longer see its workouts.
+"""
+
+import json
+import zlib
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from gymlog.gym.api.serializers import WorkoutSerializer
+from gymlog.gym.models import Workout
+from gymlog.gym.models import WorkoutArchive
+from gymlog.gym.suggestions import invalidate_suggestions
+from gymlog.gym.summaries import first_week_of_month
+from gymlog.gym.summaries import week_of
+from gymlog.gym.training_calendar import invalidate_calendar
+from gymlog.shards import current_database
+
+
+def month_of(moment: datetime) -> date:
+    """The archive month of a workout: that of the Monday of its week."""
+    return week_of(moment).replace(day=1)
+
+
+def _start_of(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def archive_cutoff(now: datetime | None = None) -> datetime:
+    """Workouts created before this moment are due for archiving."""
+    month = timezone.localdate(now).replace(day=1)
+    for _ in range(settings.WORKOUT_ARCHIVE_AFTER_MONTHS):
+        month = (month - timedelta(days=1)).replace(day=1)
+    return _start_of(first_week_of_month(month))
+
+
+def _compress(payloads: list[dict]) -> bytes:
+    return zlib.compress(json.dumps(payloads, cls=DjangoJSONEncoder).encode(), 9)
+
+
+def _decompress(data) -> list[dict]:
+    return json.loads(zlib.decompress(data))
+
+
+def archive_user(user_id) -> int:
+    """Archive the due workouts of ``user_id`` and return how many there were."""
+    if not settings.WORKOUT_ARCHIVE_AFTER_MONTHS:
+        return 0
+
+    due = Workout.objects.filter(user_id=user_id, created__lt=archive_cutoff())
+    archived = 0
+    # Oldest month first, one month per query, so a long history is never
+    # loaded at once.
+    while oldest := due.order_by("created").values_list("created", flat=True).first():
+        month = month_of(oldest)
+        next_month = (month + timedelta(days=31)).replace(day=1)
+        workouts = list(
+            due.filter(created__lt=_start_of(first_week_of_month(next_month)))
+            .prefetch_related("exercise_logs__set_logs")
+            .order_by("created"),
+        )
+        _archive_month(user_id, month, workouts)
+        archived += len(workouts)
+
+    if archived:
+        invalidate_calendar(user_id)
+        invalidate_suggestions(user_id)
+    return archived
+
+
+def _archive_month(user_id, month, workouts) -> None:
+    payloads = WorkoutSerializer(workouts, many=True).data
+    with transaction.atomic(using=current_database()):
+        archive = (
+            WorkoutArchive.objects.select_for_update()
+            .filter(user_id=user_id, month=month)
+            .first()
+        )
+        if archive is None:
+            archive = WorkoutArchive(user_id=user_id, month=month)
+        else:
+            payloads = [*_decompress(archive.data), *payloads]
+        archive.workouts = len(payloads)
+        archive.data = _compress(payloads)
+        archive.save()
+        Workout.objects.filter(pk__in=[workout.pk for workout in workouts]).delete()
+
+
+def workout_history(user_id, *, start=None, end=None, context=None) -> list[dict]:
+    """Workouts of ``user_id`` between two dates, newest first.
+
+    Archived months that overlap the range are decompressed and merged with
+    the workouts still in the log tables.
+    """
+    workouts = Workout.objects.filter(user_id=user_id).prefetch_related(
+        "exercise_logs__set_logs",
+    )
+    archives = WorkoutArchive.objects.filter(user_id=user_id)
+    if start:
+        workouts = workouts.filter(created__gte=_start_of(start))
+        archives = archives.filter(month__gte=month_of(_start_of(start)))
+    if end:
+        workouts = workouts.filter(created__lt=_start_of(end + timedelta(days=1)))
+        archives = archives.filter(month__lte=month_of(_start_of(end)))
+
+    history = list(WorkoutSerializer(workouts, many=True, context=context).data)
+    for data in archives.values_list("data", flat=True):
+        for payload in _decompress(data):
+            day = timezone.localdate(parse_datetime(payload["created"]))
+            if (start is None or day >= start) and (end is None or day <= end):
+                history.append(payload)
+    return sorted(
+        history,
+        key=lambda payload: parse_datetime(payload["created"]),
+        reverse=True,
+    )
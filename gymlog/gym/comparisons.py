@@ -0,0 +1,66 @@
+"""Per-exercise deltas between a workout and the previous run of its routine."""
+
+from django.db.models import Count
+from django.db.models import ExpressionWrapper
+from django.db.models import F
+from django.db.models import Min
+from django.db.models import Q
+from django.db.models import Sum
+
+from gymlog.gym.fields import WeightField
+from gymlog.gym.fields import volume
+from gymlog.gym.models import ExerciseLog
+from gymlog.gym.models import Workout
+
+
+def previous_workout(workout: Workout) -> Workout | None:
+    """The user's latest earlier workout of the same routine, if any."""
+    if workout.routine_id is None:
+        return None
+    # Served by workouts_routine_created_idx as a single backward index probe.
+    return (
+        Workout.objects.filter(
+            routine_id=workout.routine_id,
+            user_id=workout.user_id,
+            created__lt=workout.created,
+        )
+        .order_by("-created")
+        .only("id", "created")
+        .first()
+    )
+
+
+def compare_workouts(workout: Workout) -> dict:
+    """Sets and volume of every exercise in ``workout`` and the previous one.
+
+    Exercises are ordered as they appear in ``workout``; ones only done last
+    time come after them.
+    """
+    previous = previous_workout(workout)
+    current = Q(workout_id=workout.id)
+    before = Q(workout_id=previous.id if previous else None)
+    set_volume = volume("set_logs__")
+
+    rows = (
+        ExerciseLog.objects.filter(current | before)
+        .values("exercise_id")
+        .annotate(
+            position=Min("order", filter=current),
+            sets=Count("set_logs", filter=current),
+            previous_sets=Count("set_logs", filter=before),
+            volume=Sum(set_volume, filter=current, default=0),
+            previous_volume=Sum(set_volume, filter=before, default=0),
+        )
+        .annotate(
+            sets_delta=F("sets") - F("previous_sets"),
+            volume_delta=ExpressionWrapper(
+                F("volume") - F("previous_volume"),
+                output_field=WeightField(),
+            ),
+        )
+        .order_by(F("position").asc(nulls_last=True), "exercise_id")
+    )
+    return {
+        "previous": previous,
+        "exercises": list(rows),
+    }
@@ -0,0 +1,171 @@
+"""Write-behind buffer for the workout the user is currently logging.
+
+Autosaves land in the cache and are persisted through ``WorkoutSerializer``
+only when the workout is finished or when the periodic flush task runs.
+Every save is also listed under the minute it happened in, so the flush task
+reads the drafts saved since its last run instead of looking for workouts
+that might have one.
+"""
+
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from gymlog.gym.api.serializers import WorkoutSerializer
+from gymlog.gym.models import Workout
+from gymlog.shards import current_database
+from gymlog.shards import databases
+from gymlog.shards import use_database
+
+logger = logging.getLogger(__name__)
+
+_BUCKET_SECONDS = 60
+_CURSOR_KEY = "gym:workout-drafts:cursor"
+
+
+def _draft_key(workout_id) -> str:
+    return f"gym:workout-draft:{workout_id}"
+
+
+def _revision_key(workout_id) -> str:
+    return f"gym:workout-draft:{workout_id}:revision"
+
+
+def _flushed_key(workout_id) -> str:
+    return f"gym:workout-draft:{workout_id}:flushed"
+
+
+def _incr(key: str, timeout: int) -> int:
+    # The counter may expire or be evicted at any moment, add() included.
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout)
+        return cache.incr(key)
+
+
+def _bucket() -> int:
+    return int(timezone.now().timestamp()) // _BUCKET_SECONDS
+
+
+def _bucket_key(bucket: int, name) -> str:
+    return f"gym:workout-drafts:{bucket}:{name}"
+
+
+def _list_draft(workout: Workout) -> None:
+    # Once per workout and bucket; the count numbers the entries of a bucket.
+    timeout = settings.WORKOUT_DRAFT_TIMEOUT
+    bucket = _bucket()
+    if not cache.add(_bucket_key(bucket, workout.id), value=True, timeout=timeout):
+        return
+    entry = _incr(_bucket_key(bucket, "count"), timeout)
+    cache.set(
+        _bucket_key(bucket, entry),
+        (current_database(), str(workout.id)),
+        timeout,
+    )
+
+
+def save_draft(workout: Workout, data) -> int:
+    """Buffer a validated ``WorkoutSerializer`` payload and return its revision."""
+    timeout = settings.WORKOUT_DRAFT_TIMEOUT
+    revision = _incr(_revision_key(workout.id), timeout)
+    cache.touch(_revision_key(workout.id), timeout)
+    cache.set(_draft_key(workout.id), {"revision": revision, "data": data}, timeout)
+    _list_draft(workout)
+    return revision
+
+
+def get_draft(workout: Workout):
+    draft = cache.get(_draft_key(workout.id))
+    return draft and draft["data"]
+
+
+def _persist(workout: Workout, draft) -> None:
+    serializer = WorkoutSerializer(workout, data=draft["data"])
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+def flush_draft(workout: Workout) -> bool:
+    """Persist the buffered draft of ``workout`` if it has unsaved changes."""
+    draft = cache.get(_draft_key(workout.id))
+    if draft is None or draft["revision"] <= cache.get(_flushed_key(workout.id), 0):
+        return False
+
+    _persist(workout, draft)
+    cache.set(
+        _flushed_key(workout.id),
+        draft["revision"],
+        settings.WORKOUT_DRAFT_TIMEOUT,
+    )
+    return True
+
+
+def discard_draft(workout: Workout) -> None:
+    cache.delete_many(
+        [
+            _draft_key(workout.id),
+            _revision_key(workout.id),
+            _flushed_key(workout.id),
+        ],
+    )
+
+
+def _listed_drafts(first: int, last: int) -> dict[str, set[str]]:
+    """Ids of the workouts listed in buckets ``first`` to ``last``, by database."""
+    buckets = range(first, last + 1)
+    counts = cache.get_many([_bucket_key(bucket, "count") for bucket in buckets])
+    entries = cache.get_many(
+        [
+            _bucket_key(bucket, entry)
+            for bucket in buckets
+            for entry in range(1, counts.get(_bucket_key(bucket, "count"), 0) + 1)
+        ],
+    )
+    listed = defaultdict(set)
+    for database, workout_id in entries.values():
+        listed[database].add(workout_id)
+    return listed
+
+
+def flush_drafts() -> int:
+    """Persist every draft with unsaved changes and return how many were saved."""
+    current = _bucket()
+    # Older buckets have expired along with their drafts.
+    oldest = current - settings.WORKOUT_DRAFT_TIMEOUT // _BUCKET_SECONDS
+    listed = _listed_drafts(max(cache.get(_CURSOR_KEY, oldest), oldest), current)
+
+    saved = 0
+    for database in databases():
+        if listed[database]:
+            with use_database(database):
+                saved += _flush_drafts(listed[database])
+    # The last two buckets are read again next time, as a save may still be
+    # listing its draft there. Drafts flushed already are skipped by revision.
+    cache.set(_CURSOR_KEY, current - 1, None)
+    return saved
+
+
+def _flush_drafts(workout_ids) -> int:
+    drafts = cache.get_many([_draft_key(pk) for pk in workout_ids])
+    flushed = cache.get_many([_flushed_key(pk) for pk in workout_ids])
+    pending_ids = [
+        pk
+        for pk in workout_ids
+        if _draft_key(pk) in drafts
+        and drafts[_draft_key(pk)]["revision"] > flushed.get(_flushed_key(pk), 0)
+    ]
+
+    saved = 0
+    for workout in Workout.objects.filter(pk__in=pending_ids):
+        try:
+            saved += flush_draft(workout)
+        except ValidationError:
+            logger.exception("Discarding invalid draft of workout %s", workout.pk)
+            discard_draft(workout)
+    return saved
@@ -0,0 +1,35 @@
+from django.db.models import ExpressionWrapper
+from django.db.models import F
+from django.db.models import FloatField
+
+GRAMS_PER_KILOGRAM = 1000
+
+
+class WeightField(FloatField):
+    """Kilograms as a float in Python, stored as whole grams in an integer.
+
+    Arithmetic on the column happens in grams. Wrap it in an expression with
+    ``output_field=WeightField()`` to get kilograms back, as ``volume`` does.
+    """
+
+    def get_internal_type(self):
+        return "IntegerField"
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None:
+            return None
+        return round(value * GRAMS_PER_KILOGRAM)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return value / GRAMS_PER_KILOGRAM
+
+
+def volume(prefix: str = "") -> ExpressionWrapper:
+    """Weight times reps of a set, in kilograms."""
+    return ExpressionWrapper(
+        F(f"{prefix}weight") * F(f"{prefix}reps"),
+        output_field=WeightField(),
+    )
@@ -0,0 +1,172 @@
+"""Routine generation from the exercise catalog.
+
+The catalog is loaded with one query into NumPy bitsets, one bit per muscle
+group and per equipment. Candidates are filtered with a single mask, then
+picked greedily by how many still-uncovered target muscles they work, so the
+solver never goes back to the database.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from gymlog import shards
+from gymlog.gym.models import Exercise
+from gymlog.gym.models import Routine
+from gymlog.gym.models import RoutineExercise
+from gymlog.gym.models import RoutineSet
+
+# One working set plus the rest after it.
+MINUTES_PER_SET = 3
+SETS_PER_EXERCISE = 3
+MAX_EXERCISES = 12
+# Working a target as the primary muscle counts for this many secondary hits.
+PRIMARY_SCORE = 3
+DEFAULT_REPS = 10
+REPS = {
+    Exercise.ExerciseTypes.REPS_ONLY: 12,
+    Exercise.ExerciseTypes.BODYWEIGHT_REPS: 12,
+    Exercise.ExerciseTypes.BODYWEIGHT_ASSISTED_REPS: 12,
+    Exercise.ExerciseTypes.ASSISTED_BODYWEIGHT: 12,
+    Exercise.ExerciseTypes.DURATION: 1,
+    Exercise.ExerciseTypes.WEIGHT_DURATION: 1,
+    Exercise.ExerciseTypes.DISTANCE_DURATION: 1,
+    Exercise.ExerciseTypes.WEIGHT_DISTANCE: 1,
+    Exercise.ExerciseTypes.SHORT_DISTANCE_WEIGHT: 1,
+}
+
+MUSCLE_BITS = {
+    muscle: 1 << bit for bit, muscle in enumerate(Exercise.MuscleGroups.values)
+}
+EQUIPMENT_BITS = {
+    equipment: 1 << bit for bit, equipment in enumerate(Exercise.Equipments.values)
+}
+# Bodyweight exercises need no equipment and are always available.
+EQUIPMENT_BITS[""] = EQUIPMENT_BITS[Exercise.Equipments.NONE]
+
+
+class Catalog(NamedTuple):
+    ids: list
+    exercise_types: list[str]
+    primary: np.ndarray
+    muscles: np.ndarray
+    equipment: np.ndarray
+
+
+def muscle_mask(muscles) -> int:
+    mask = 0
+    for muscle in muscles:
+        mask |= MUSCLE_BITS[muscle]
+    return mask
+
+
+def equipment_mask(equipment) -> int:
+    mask = EQUIPMENT_BITS[Exercise.Equipments.NONE]
+    for item in equipment:
+        mask |= EQUIPMENT_BITS[item]
+    return mask
+
+
+def build_catalog(rows) -> Catalog:
+    """Bitsets from ``(id, exercise_type, equipment, primary, other)`` rows."""
+    rows = list(rows)
+    return Catalog(
+        ids=[row[0] for row in rows],
+        exercise_types=[row[1] for row in rows],
+        primary=np.fromiter(
+            (MUSCLE_BITS[row[3]] for row in rows),
+            dtype=np.uint32,
+            count=len(rows),
+        ),
+        muscles=np.fromiter(
+            (MUSCLE_BITS[row[3]] | muscle_mask(row[4]) for row in rows),
+            dtype=np.uint32,
+            count=len(rows),
+        ),
+        equipment=np.fromiter(
+            (EQUIPMENT_BITS[row[2]] for row in rows),
+            dtype=np.uint32,
+            count=len(rows),
+        ),
+    )
+
+
+def load_catalog() -> Catalog:
+    return build_catalog(
+        Exercise.objects.order_by("pk").values_list(
+            "id",
+            "exercise_type",
+            "equipment",
+            "primary_muscle_group",
+            "other_muscles",
+        ),
+    )
+
+
+def select_exercises(catalog: Catalog, *, muscles, equipment, count) -> list[int]:
+    """Indexes of up to ``count`` catalog exercises covering ``muscles``.
+
+    Every pick works the most target muscles nobody has trained as primary
+    yet; once all of them are, coverage starts over for the next round.
+    """
+    targets = muscle_mask(muscles)
+    available = (catalog.equipment & equipment_mask(equipment)) != 0
+    available &= (catalog.muscles & targets) != 0
+
+    chosen = []
+    uncovered = targets
+    while len(chosen) < count and available.any():
+        score = np.bitwise_count(catalog.muscles & uncovered).astype(np.int64)
+        score += (PRIMARY_SCORE - 1) * ((catalog.primary & uncovered) != 0)
+        score[~available] = -1
+        best = int(np.argmax(score))
+        if score[best] <= 0:
+            # Every target is covered; let the next round start over.
+            uncovered = targets
+            continue
+        chosen.append(best)
+        available[best] = False
+        uncovered &= ~int(catalog.primary[best])
+        if not uncovered:
+            uncovered = targets
+    return chosen
+
+
+def exercise_count(duration: int) -> int:
+    """How many exercises fit in a session of ``duration`` minutes."""
+    per_exercise = SETS_PER_EXERCISE * MINUTES_PER_SET
+    return max(1, min(MAX_EXERCISES, duration // per_exercise))
+
+
+@shards.atomic
+def generate_routine(user, *, name, muscles, equipment, duration) -> Routine | None:
+    """Create a routine for ``muscles`` that fits ``duration`` minutes.
+
+    Returns ``None`` when no exercise in the catalog matches.
+    """
+    catalog = load_catalog()
+    chosen = select_exercises(
+        catalog,
+        muscles=muscles,
+        equipment=equipment,
+        count=exercise_count(duration),
+    )
+    if not chosen:
+        return None
+
+    routine = Routine.objects.create(user=user, name=name)
+    routine_exercises = RoutineExercise.objects.bulk_create(
+        RoutineExercise(routine=routine, exercise_id=catalog.ids[index], order=order)
+        for order, index in enumerate(chosen, start=1)
+    )
+    RoutineSet.objects.bulk_create(
+        RoutineSet(
+            routine_exercise=routine_exercise,
+            order=order,
+            weight=0.0,
+            reps=REPS.get(catalog.exercise_types[index], DEFAULT_REPS),
+        )
+        for routine_exercise, index in zip(routine_exercises, chosen, strict=True)
+        for order in range(1, SETS_PER_EXERCISE + 1)
+    )
+    return routine
@@ -0,0 +1,65 @@
+from time import perf_counter
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from gymlog.gym.generator import build_catalog
+from gymlog.gym.generator import exercise_count
+from gymlog.gym.generator import select_exercises
+from gymlog.gym.models import Exercise
+
+BUDGET_MS = 50
+
+
+class Command(BaseCommand):
+    help = "Time routine generation over a synthetic exercise catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--exercises",
+            type=int,
+            default=5_000,
+            help="Number of exercises in the synthetic catalog.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=10,
+            help="How many routines to generate.",
+        )
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        muscles = [choice[0] for choice in Exercise.MuscleGroups.choices]
+        equipment = [choice[0] for choice in Exercise.Equipments.choices]
+        exercise_types = [choice[0] for choice in Exercise.ExerciseTypes.choices]
+        rows = [
+            (
+                index,
+                rng.choice(exercise_types),
+                rng.choice(equipment),
+                rng.choice(muscles),
+                list(rng.choice(muscles, size=rng.integers(0, 4), replace=False)),
+            )
+            for index in range(options["exercises"])
+        ]
+
+        timings = []
+        for _ in range(options["repeat"]):
+            started = perf_counter()
+            select_exercises(
+                build_catalog(rows),
+                muscles=rng.choice(muscles, size=3, replace=False),
+                equipment=rng.choice(equipment, size=2, replace=False),
+                count=exercise_count(90),
+            )
+            timings.append(perf_counter() - started)
+
+        best = min(timings) * 1000
+        median = np.median(timings) * 1000
+        message = (
+            f"{options['exercises']} exercises: "
+            f"best {best:.1f} ms, median {median:.1f} ms (budget {BUDGET_MS} ms)"
+        )
+        style = self.style.SUCCESS if median <= BUDGET_MS else self.style.ERROR
+        self.stdout.write(style(message))
@@ -0,0 +1,47 @@
+from time import perf_counter
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from gymlog.gym.analytics import SECONDS_PER_DAY
+from gymlog.gym.analytics import progress
+
+SETS_PER_WORKOUT = 20
+
+
+class Command(BaseCommand):
+    help = "Time the progress analytics on a synthetic multi-year set history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sets",
+            type=int,
+            default=100_000,
+            help="Number of sets in the synthetic history.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=10,
+            help="How many times to run the computation.",
+        )
+
+    def handle(self, *args, **options):
+        sets = options["sets"]
+        rng = np.random.default_rng(0)
+        workouts = np.arange(sets) // SETS_PER_WORKOUT
+        epoch = 1_500_000_000 + workouts * 2.0 * SECONDS_PER_DAY
+        weight = rng.uniform(20, 150, sets).round(1)
+        reps = rng.integers(1, 15, sets).astype(np.float64)
+
+        timings = []
+        for _ in range(options["repeat"]):
+            started = perf_counter()
+            progress((epoch, weight, reps))
+            timings.append(perf_counter() - started)
+
+        self.stdout.write(
+            f"{sets} sets, {workouts[-1] + 1} workouts: "
+            f"best {min(timings) * 1000:.1f} ms, "
+            f"median {np.median(timings) * 1000:.1f} ms",
+        )
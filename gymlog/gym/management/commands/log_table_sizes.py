@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+TABLES = ["workouts", "exercise_logs", "set_logs"]
+
+# Partitions are summed into their parent table.
+_SIZES_SQL = """
+WITH tables AS (
+    SELECT c.oid, COALESCE(i.inhparent, c.oid)::regclass::text AS name
+    FROM pg_class c
+    LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+    WHERE c.relkind = 'r'
+)
+SELECT
+    t.name,
+    SUM(c.reltuples)::bigint,
+    SUM(pg_table_size(t.oid)),
+    SUM(pg_indexes_size(t.oid))
+FROM tables t
+JOIN pg_class c ON c.oid = t.oid
+WHERE t.name = ANY(%s)
+GROUP BY t.name
+"""
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / 2**20:.1f} MB"
+
+
+class Command(BaseCommand):
+    help = "Report the disk footprint of the workout log tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="ANALYZE the tables first so row counts are current.",
+        )
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            if options["analyze"]:
+                for table in TABLES:
+                    cursor.execute(f"ANALYZE {table}")
+            cursor.execute(_SIZES_SQL, [TABLES])
+            sizes = {name: rest for name, *rest in cursor.fetchall()}
+
+        for table in TABLES:
+            rows, heap, indexes = sizes.get(table, (0, 0, 0))
+            per_row = (heap + indexes) / rows if rows > 0 else 0
+            self.stdout.write(
+                f"{table}: {rows} rows, table {_megabytes(heap)}, "
+                f"indexes {_megabytes(indexes)}, {per_row:.0f} bytes per row",
+            )
@@ -0,0 +1,213 @@
+"""Monthly range partitioning of exercise_logs and set_logs by ``performed``.
+
+``convert`` turns both tables into partitioned tables in place, keeping every
+existing row in a DEFAULT partition. ``create`` then adds one partition per
+month, for months that still have rows in the default partition and for the
+next ``--months`` months. It moves each month's rows out of the default
+partition in its own transaction. ``detach`` detaches months older than
+``--before`` so they can be archived or dropped without touching hot data.
+"""
+
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+# Parents first: set_logs references exercise_logs.
+TABLES = {"exercise_logs": "workout_id", "set_logs": "exercise_log_id"}
+
+
+def _next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _bound(month: date) -> str:
+    return datetime.combine(month, time.min, tzinfo=UTC).isoformat()
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def is_partitioned(table: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [table])
+        return cursor.fetchone()[0] == "p"
+
+
+def partitions(table: str) -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = %s::regclass ORDER BY 1",
+            [table],
+        )
+        return [name for (name,) in cursor.fetchall()]
+
+
+class Command(BaseCommand):
+    help = "Partition exercise_logs and set_logs by month of the workout."
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["convert", "create", "detach"])
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=3,
+            help="Months ahead of the current one to create partitions for.",
+        )
+        parser.add_argument(
+            "--before",
+            type=date.fromisoformat,
+            help="Detach the partitions of months before this date.",
+        )
+
+    def handle(self, *args, **options):
+        if options["action"] == "convert":
+            self.convert()
+            return
+        if not is_partitioned("set_logs"):
+            msg = "Run `partition_logs convert` first."
+            raise CommandError(msg)
+        if options["action"] == "create":
+            self.create(options["months"])
+        else:
+            if options["before"] is None:
+                msg = "--before is required to detach partitions."
+                raise CommandError(msg)
+            self.detach(options["before"])
+
+    @transaction.atomic
+    def convert(self):
+        if is_partitioned("set_logs"):
+            self.stdout.write("Already partitioned.")
+            return
+        with connection.cursor() as cursor:
+            # ALTER TABLE refuses to run with foreign key checks still queued.
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute(
+                "LOCK TABLE exercise_logs, set_logs IN ACCESS EXCLUSIVE MODE",
+            )
+            # Recreated on (exercise_log_id, performed) once both are converted.
+            for (name,) in self._constraints(cursor, "set_logs", "f", "exercise_logs"):
+                cursor.execute(f"ALTER TABLE set_logs DROP CONSTRAINT {name}")
+            for table, parent_column in TABLES.items():
+                self._convert(cursor, table, parent_column)
+            cursor.execute(
+                "ALTER TABLE set_logs ADD FOREIGN KEY (exercise_log_id, performed) "
+                "REFERENCES exercise_logs (id, performed) "
+                "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED",
+            )
+        self.stdout.write(self.style.SUCCESS("Converted to partitioned tables."))
+
+    def _constraints(self, cursor, table, kind, referenced=None):
+        sql = (
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = %s"
+        )
+        params = [table, kind]
+        if referenced is not None:
+            sql += " AND confrelid = %s::regclass"
+            params.append(referenced)
+        cursor.execute(sql, params)
+        return [(name,) if referenced else (name, d) for name, d in cursor.fetchall()]
+
+    def _convert(self, cursor, table, parent_column):
+        default = f"{table}_default"
+        cursor.execute(
+            "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+            "WHERE indrelid = %s::regclass AND NOT indisunique",
+            [table],
+        )
+        indexes = [definition.split(" USING ", 1)[1] for (definition,) in cursor]
+        foreign_keys = self._constraints(cursor, table, "f")
+        [(primary_key, _)] = self._constraints(cursor, table, "p")
+
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {default}")
+        # Every unique index of a partition must include the partition key,
+        # the primary key of the old table included.
+        cursor.execute(
+            f"CREATE UNIQUE INDEX {default}_key ON {default} (id, performed)",
+        )
+        cursor.execute(f"ALTER TABLE {default} DROP CONSTRAINT {primary_key}")
+        cursor.execute(
+            f"ALTER TABLE {default} ADD CONSTRAINT {default}_pkey "
+            f"PRIMARY KEY USING INDEX {default}_key",
+        )
+
+        cursor.execute(
+            f"CREATE TABLE {table} (LIKE {default} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (performed)",
+        )
+        cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, performed)")
+        cursor.execute(
+            f'ALTER TABLE {table} ADD UNIQUE ({parent_column}, performed, "order")',
+        )
+        for index in indexes:
+            cursor.execute(f"CREATE INDEX ON {table} USING {index}")
+        for _, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {table} ADD {definition}")
+        cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+
+    def create(self, months_ahead):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT DISTINCT date_trunc('month', performed AT TIME ZONE 'UTC') "
+                "FROM exercise_logs_default",
+            )
+            months = {row[0].date() for row in cursor.fetchall()}
+        month = timezone.now().astimezone(UTC).date().replace(day=1)
+        for _ in range(months_ahead + 1):
+            months.add(month)
+            month = _next_month(month)
+
+        existing = set(partitions("set_logs"))
+        for month in sorted(months):
+            if partition_name("set_logs", month) not in existing:
+                moved = self._create_month(month)
+                self.stdout.write(f"Created {month:%Y-%m}, moved {moved} rows.")
+
+    @transaction.atomic
+    def _create_month(self, month) -> int:
+        start, end = _bound(month), _bound(_next_month(month))
+        moved = 0
+        with connection.cursor() as cursor:
+            # Checked as each statement runs, so sets leave before their
+            # exercise logs and come back after them.
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            for table in reversed(TABLES):
+                cursor.execute(f"CREATE TEMPORARY TABLE {table}_moving (LIKE {table})")
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {table}_default "  # noqa: S608
+                    "WHERE performed >= %s AND performed < %s RETURNING *) "
+                    f"INSERT INTO {table}_moving SELECT * FROM moved",
+                    [start, end],
+                )
+                moved += cursor.rowcount
+            for table in TABLES:
+                cursor.execute(
+                    f"CREATE TABLE {partition_name(table, month)} "
+                    f"PARTITION OF {table} FOR VALUES FROM ('{start}') TO ('{end}')",
+                )
+                cursor.execute(f"INSERT INTO {table} SELECT * FROM {table}_moving")  # noqa: S608
+                cursor.execute(f"DROP TABLE {table}_moving")
+        return moved
+
+    def detach(self, before):
+        before = before.replace(day=1)
+        # Children first, so no detached set references a remaining log.
+        for table in reversed(TABLES):
+            for name in partitions(table):
+                if name.endswith("_default") or name >= partition_name(table, before):
+                    continue
+                with connection.cursor() as cursor:
+                    cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+                    cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                self.stdout.write(f"Detached {name}.")
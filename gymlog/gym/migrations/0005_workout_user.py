@@ -0,0 +1,33 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("gym", "0004_alter_workout_options_alter_workout_unique_together_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workout",
+            name="user",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="workouts",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workout",
+            index=models.Index(
+                fields=["user", "-created"],
+                name="workouts_user_created_idx",
+            ),
+        ),
+    ]
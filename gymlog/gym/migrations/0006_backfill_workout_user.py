@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import migrations
+from django.db import transaction
+from django.db.models import OuterRef
+from django.db.models import Subquery
+
+BATCH_SIZE = 5000
+QUARANTINE_USERNAME = "orphaned-workouts"
+
+
+def backfill_workout_user(apps, schema_editor):
+    Routine = apps.get_model("gym", "Routine")
+    Workout = apps.get_model("gym", "Workout")
+    db = schema_editor.connection.alias
+
+    routine_user = Routine.objects.filter(pk=OuterRef("routine_id")).values("user_id")
+    pending = Workout.objects.using(db).filter(user__isnull=True, routine__isnull=False)
+
+    # Each batch is its own short transaction so the table is never locked
+    # as a whole while a large history is being backfilled.
+    pending_pks = pending.order_by("pk").values_list("pk", flat=True)
+    while batch := list(pending_pks[:BATCH_SIZE]):
+        with transaction.atomic(using=db):
+            Workout.objects.using(db).filter(pk__in=batch).update(
+                user_id=Subquery(routine_user[:1]),
+            )
+
+    # Workouts whose routine was deleted earlier have no owner left to
+    # attribute them to. They go to an inactive quarantine user, who cannot
+    # sign in, so an operator can decide what to do with them.
+    orphans = Workout.objects.using(db).filter(user__isnull=True)
+    if orphans.exists():
+        User = apps.get_model(settings.AUTH_USER_MODEL)
+        quarantine, _ = User.objects.using(db).get_or_create(
+            username=QUARANTINE_USERNAME,
+            defaults={"is_active": False, "password": "!"},
+        )
+        orphans.update(user=quarantine)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("gym", "0005_workout_user"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_workout_user, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("gym", "0006_backfill_workout_user"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="workout",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="workouts",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
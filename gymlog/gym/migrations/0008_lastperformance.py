@@ -0,0 +1,81 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:24
+
+import django.db.models.deletion
+import django.utils.timezone
+import gymlog.mixins
+import model_utils.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gym", "0007_alter_workout_user"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LastPerformance",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=gymlog.mixins.generate_uuid7,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                ("performed", models.DateTimeField(verbose_name="Performed")),
+                ("sets", models.JSONField(default=list, verbose_name="Sets")),
+                (
+                    "exercise",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="gym.exercise",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="last_performances",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "workout",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="gym.workout",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Last Performance",
+                "verbose_name_plural": "Last Performances",
+                "db_table": "last_performances",
+                "unique_together": {("user", "exercise")},
+            },
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:25
+
+import django.db.models.deletion
+import django.utils.timezone
+import gymlog.mixins
+import model_utils.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gym", "0008_lastperformance"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WeeklySummary",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=gymlog.mixins.generate_uuid7,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                ("week", models.DateField(verbose_name="Week")),
+                (
+                    "muscle_group",
+                    models.CharField(
+                        choices=[
+                            ("abdominals", "Abdominals"),
+                            ("abductors", "Abductors"),
+                            ("adductors", "Adductors"),
+                            ("biceps", "Biceps"),
+                            ("lower_back", "Lower Back"),
+                            ("upper_back", "Upper Back"),
+                            ("cardio", "Cardio"),
+                            ("chest", "Chest"),
+                            ("calves", "Calves"),
+                            ("forearms", "Forearms"),
+                            ("glutes", "Glutes"),
+                            ("hamstrings", "Hamstrings"),
+                            ("lats", "Lats"),
+                            ("quadriceps", "Quadriceps"),
+                            ("shoulders", "Shoulders"),
+                            ("triceps", "Triceps"),
+                            ("traps", "Traps"),
+                            ("neck", "Neck"),
+                            ("full_body", "Full Body"),
+                            ("other", "Other"),
+                        ],
+                        max_length=255,
+                        verbose_name="Muscle group",
+                    ),
+                ),
+                ("sets", models.PositiveIntegerField(default=0, verbose_name="Sets")),
+                ("reps", models.PositiveIntegerField(default=0, verbose_name="Reps")),
+                ("volume", models.FloatField(default=0.0, verbose_name="Volume")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="weekly_summaries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Weekly Summary",
+                "verbose_name_plural": "Weekly Summaries",
+                "db_table": "weekly_summaries",
+                "ordering": ["week", "muscle_group"],
+                "unique_together": {("user", "week", "muscle_group")},
+            },
+        ),
+    ]
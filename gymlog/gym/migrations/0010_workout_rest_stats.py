@@ -0,0 +1,25 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gym", "0009_weeklysummary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workout",
+            name="average_rest",
+            field=models.DurationField(
+                blank=True, null=True, verbose_name="Average Rest"
+            ),
+        ),
+        migrations.AddField(
+            model_name="workout",
+            name="density",
+            field=models.FloatField(blank=True, null=True, verbose_name="Density"),
+        ),
+    ]
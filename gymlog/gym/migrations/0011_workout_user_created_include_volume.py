@@ -0,0 +1,27 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gym", "0010_workout_rest_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="workout",
+            name="workouts_user_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="workout",
+            index=models.Index(
+                fields=["user", "-created"],
+                include=("volume",),
+                name="workouts_user_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gym", "0011_workout_user_created_include_volume"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="workout",
+            index=models.Index(
+                fields=["routine", "-created"],
+                name="workouts_routine_created_idx",
+            ),
+        ),
+    ]
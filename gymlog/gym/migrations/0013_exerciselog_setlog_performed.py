@@ -0,0 +1,29 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gym", "0012_workout_routine_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exerciselog",
+            name="performed",
+            field=models.DateTimeField(
+                editable=False,
+                null=True,
+                verbose_name="Performed",
+            ),
+        ),
+        migrations.AddField(
+            model_name="setlog",
+            name="performed",
+            field=models.DateTimeField(
+                editable=False,
+                null=True,
+                verbose_name="Performed",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.db import transaction
+from django.db.models import OuterRef
+from django.db.models import Subquery
+
+BATCH_SIZE = 5000
+
+
+def _backfill(db, model, parent, parent_field, performed_field):
+    parent_performed = parent.objects.filter(pk=OuterRef(parent_field)).values(
+        performed_field,
+    )
+    pending_pks = (
+        model.objects.using(db)
+        .filter(performed__isnull=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    # Short transactions per batch, as in 0006_backfill_workout_user.
+    while batch := list(pending_pks[:BATCH_SIZE]):
+        with transaction.atomic(using=db):
+            model.objects.using(db).filter(pk__in=batch).update(
+                performed=Subquery(parent_performed[:1]),
+            )
+
+
+def backfill_performed(apps, schema_editor):
+    Workout = apps.get_model("gym", "Workout")
+    ExerciseLog = apps.get_model("gym", "ExerciseLog")
+    SetLog = apps.get_model("gym", "SetLog")
+
+    db = schema_editor.connection.alias
+
+    _backfill(db, ExerciseLog, Workout, "workout_id", "created")
+    _backfill(db, SetLog, ExerciseLog, "exercise_log_id", "performed")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("gym", "0013_exerciselog_setlog_performed"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_performed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gym", "0014_backfill_performed"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="exerciselog",
+            name="performed",
+            field=models.DateTimeField(editable=False, verbose_name="Performed"),
+        ),
+        migrations.AlterField(
+            model_name="setlog",
+            name="performed",
+            field=models.DateTimeField(editable=False, verbose_name="Performed"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="exerciselog",
+            unique_together={("workout", "performed", "order")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="setlog",
+            unique_together={("exercise_log", "performed", "order")},
+        ),
+    ]
@@ -0,0 +1,198 @@
+"""Narrower rows for exercise_logs and set_logs.
+
+``created`` is dropped, as the UUIDv7 key already records it. ``order`` and
+``reps`` become smallints, and ``weight`` becomes integer grams. Plain tables
+are copied into a new table whose columns are ordered widest first. That
+leaves no alignment padding and no null bitmap for the dropped column.
+Tables that ``partition_logs`` has converted are altered in place instead.
+Either way the tables are locked for the whole rewrite.
+"""
+
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+import gymlog.gym.fields
+
+# Columns of the rebuilt tables, in storage order, with how each is copied.
+LAYOUTS = {
+    "exercise_logs": [
+        ("id", "uuid", "id"),
+        ("workout_id", "uuid", "workout_id"),
+        ("exercise_id", "uuid", "exercise_id"),
+        ("performed", "timestamp with time zone", "performed"),
+        ("modified", "timestamp with time zone", "modified"),
+        ("order", "smallint", '"order"'),
+    ],
+    "set_logs": [
+        ("id", "uuid", "id"),
+        ("exercise_log_id", "uuid", "exercise_log_id"),
+        ("performed", "timestamp with time zone", "performed"),
+        ("end", "timestamp with time zone NULL", '"end"'),
+        ("modified", "timestamp with time zone", "modified"),
+        ("weight", "integer", "round(weight * 1000)"),
+        ("order", "smallint", '"order"'),
+        ("reps", "smallint", "reps"),
+    ],
+}
+
+ALTER_SQL = {
+    "exercise_logs": 'DROP COLUMN created, ALTER COLUMN "order" TYPE smallint',
+    "set_logs": (
+        'DROP COLUMN created, ALTER COLUMN "order" TYPE smallint, '
+        "ALTER COLUMN reps TYPE smallint, "
+        "ALTER COLUMN weight TYPE integer USING round(weight * 1000)"
+    ),
+}
+
+# ``created`` is restored from the millisecond timestamp in the UUIDv7 key.
+UUID7_CREATED = (
+    "to_timestamp(('x' || left(replace(id::text, '-', ''), 12))::bit(48)::bigint"
+    " / 1000.0)"
+)
+WIDEN_SQL = f"""
+ALTER TABLE exercise_logs
+    ADD COLUMN created timestamp with time zone,
+    ALTER COLUMN "order" TYPE integer;
+ALTER TABLE exercise_logs
+    ALTER COLUMN created TYPE timestamp with time zone USING {UUID7_CREATED},
+    ALTER COLUMN created SET NOT NULL;
+ALTER TABLE set_logs
+    ADD COLUMN created timestamp with time zone,
+    ALTER COLUMN "order" TYPE integer,
+    ALTER COLUMN reps TYPE integer,
+    ALTER COLUMN weight TYPE double precision USING weight / 1000.0;
+ALTER TABLE set_logs
+    ALTER COLUMN created TYPE timestamp with time zone USING {UUID7_CREATED},
+    ALTER COLUMN created SET NOT NULL;
+"""
+
+
+def _rebuild(cursor, table, layout):
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass",
+        [table],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) "
+        "FROM pg_constraint WHERE confrelid = %s::regclass AND conrelid <> confrelid",
+        [table],
+    )
+    references = cursor.fetchall()
+    cursor.execute(
+        "SELECT pg_get_indexdef(indexrelid) FROM pg_index i "
+        "WHERE indrelid = %s::regclass AND NOT EXISTS "
+        "(SELECT 1 FROM pg_constraint WHERE conindid = i.indexrelid)",
+        [table],
+    )
+    indexes = [definition for (definition,) in cursor.fetchall()]
+
+    columns = ", ".join(
+        f'"{name}" {column_type}'
+        + ("" if column_type.endswith("NULL") else " NOT NULL")
+        for name, column_type, _ in layout
+    )
+    names = ", ".join(f'"{name}"' for name, _, _ in layout)
+    values = ", ".join(source for _, _, source in layout)
+    cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+    cursor.execute(f"CREATE TABLE {table}_compact ({columns})")
+    cursor.execute(
+        f"INSERT INTO {table}_compact ({names}) SELECT {values} FROM {table}",  # noqa: S608
+    )
+    for referencing, name, _ in references:
+        cursor.execute(f"ALTER TABLE {referencing} DROP CONSTRAINT {name}")
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {table}_compact RENAME TO {table}")
+    for name, definition in constraints:
+        cursor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+    for definition in indexes:
+        cursor.execute(definition)
+    for referencing, name, definition in references:
+        cursor.execute(f"ALTER TABLE {referencing} ADD CONSTRAINT {name} {definition}")
+
+
+def compact(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        # Queued foreign key checks would block the ALTER TABLEs below.
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        for table, layout in LAYOUTS.items():
+            cursor.execute(
+                "SELECT relkind FROM pg_class WHERE oid = %s::regclass",
+                [table],
+            )
+            if cursor.fetchone()[0] == "p":
+                cursor.execute(f"ALTER TABLE {table} {ALTER_SQL[table]}")
+            else:
+                _rebuild(cursor, table, layout)
+
+
+def widen(apps, schema_editor):
+    schema_editor.execute(WIDEN_SQL)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gym", "0015_alter_exerciselog_setlog_performed"),
+    ]
+
+    operations = [
+        # Served by the leading column of the (parent, performed, order)
+        # unique indexes.
+        migrations.AlterField(
+            model_name="exerciselog",
+            name="workout",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="exercise_logs",
+                to="gym.workout",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="setlog",
+            name="exercise_log",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="set_logs",
+                to="gym.exerciselog",
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(compact, widen),
+            ],
+            state_operations=[
+                migrations.RemoveField(
+                    model_name="exerciselog",
+                    name="created",
+                ),
+                migrations.RemoveField(
+                    model_name="setlog",
+                    name="created",
+                ),
+                migrations.AlterField(
+                    model_name="exerciselog",
+                    name="order",
+                    field=models.PositiveSmallIntegerField(verbose_name="Order"),
+                ),
+                migrations.AlterField(
+                    model_name="setlog",
+                    name="order",
+                    field=models.PositiveSmallIntegerField(verbose_name="Order"),
+                ),
+                migrations.AlterField(
+                    model_name="setlog",
+                    name="reps",
+                    field=models.PositiveSmallIntegerField(verbose_name="Reps"),
+                ),
+                migrations.AlterField(
+                    model_name="setlog",
+                    name="weight",
+                    field=gymlog.gym.fields.WeightField(verbose_name="Weight"),
+                ),
+            ],
+        ),
+    ]
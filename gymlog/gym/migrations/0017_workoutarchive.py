@@ -0,0 +1,79 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:58
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.conf import settings
+from django.db import migrations
+from django.db import models
+
+import gymlog.mixins
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gym", "0016_compact_log_rows"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="lastperformance",
+            name="workout",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="gym.workout",
+            ),
+        ),
+        migrations.CreateModel(
+            name="WorkoutArchive",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=gymlog.mixins.generate_uuid7,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                ("month", models.DateField(verbose_name="Month")),
+                ("workouts", models.PositiveIntegerField(verbose_name="Workouts")),
+                ("data", models.BinaryField(verbose_name="Data")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="workout_archives",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Workout Archive",
+                "verbose_name_plural": "Workout Archives",
+                "db_table": "workout_archives",
+                "ordering": ["month"],
+                "unique_together": {("user", "month")},
+            },
+        ),
+    ]
@@ -0,0 +1,181 @@
+"""ON DELETE clauses on the foreign keys to users, routines and workouts.
+
+The models switch to ``DO_NOTHING`` so the deletion collector no longer loads
+child rows; the database removes them instead. Each foreign key is dropped
+and re-added with the same definition plus its ON DELETE action, which also
+covers the composite set_logs key added by ``partition_logs``.
+"""
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations
+from django.db import models
+
+# Table and column of each foreign key, with the action the database takes.
+FOREIGN_KEYS = [
+    ("routines", "user_id", "CASCADE"),
+    ("routine_exercises", "routine_id", "CASCADE"),
+    ("routine_sets", "routine_exercise_id", "CASCADE"),
+    ("workouts", "user_id", "CASCADE"),
+    ("workouts", "routine_id", "SET NULL"),
+    ("exercise_logs", "workout_id", "CASCADE"),
+    ("set_logs", "exercise_log_id", "CASCADE"),
+    ("last_performances", "user_id", "CASCADE"),
+    ("last_performances", "workout_id", "SET NULL"),
+    ("weekly_summaries", "user_id", "CASCADE"),
+    ("workout_archives", "user_id", "CASCADE"),
+]
+
+# Clones on the partitions of a partitioned table follow their parent.
+_FOREIGN_KEYS_SQL = """
+SELECT c.conname, pg_get_constraintdef(c.oid)
+FROM pg_constraint c
+JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+WHERE c.conrelid = %s::regclass AND c.contype = 'f' AND c.conparentid = 0
+    AND a.attname = %s
+"""
+
+
+def _set_on_delete(schema_editor, actions):
+    with schema_editor.connection.cursor() as cursor:
+        # Queued foreign key checks would block the ALTER TABLEs below.
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        for table, column, action in actions:
+            cursor.execute(_FOREIGN_KEYS_SQL, [table, column])
+            for name, definition in cursor.fetchall():
+                clause = f" ON DELETE {action} DEFERRABLE" if action else " DEFERRABLE"
+                new_definition = re.sub(
+                    r"( ON DELETE (CASCADE|SET NULL))? DEFERRABLE",
+                    clause,
+                    definition,
+                )
+                cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {name}")
+                cursor.execute(
+                    f"ALTER TABLE {table} ADD CONSTRAINT {name} {new_definition}",
+                )
+
+
+def add_on_delete(apps, schema_editor):
+    _set_on_delete(schema_editor, FOREIGN_KEYS)
+
+
+def remove_on_delete(apps, schema_editor):
+    _set_on_delete(schema_editor, [(t, c, None) for t, c, _ in FOREIGN_KEYS])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gym", "0017_workoutarchive"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="exerciselog",
+            name="workout",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="exercise_logs",
+                to="gym.workout",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="lastperformance",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="last_performances",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="lastperformance",
+            name="workout",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="gym.workout",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="routine",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="routines",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="routineexercise",
+            name="routine",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="routine_exercises",
+                to="gym.routine",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="routineset",
+            name="routine_exercise",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="routine_sets",
+                to="gym.routineexercise",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="setlog",
+            name="exercise_log",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="set_logs",
+                to="gym.exerciselog",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="weeklysummary",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="weekly_summaries",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="workout",
+            name="routine",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="workouts",
+                to="gym.routine",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="workout",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="workouts",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="workoutarchive",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="workout_archives",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(add_on_delete, remove_on_delete),
+    ]
@@ -1,20 +1,33 @@
 from django.conf import settings
 from django.db.models import CASCADE
-from django.db.models import SET_NULL
+from django.db.models import DO_NOTHING
+from django.db.models import BinaryField
 from django.db.models import CharField
+from django.db.models import DateField
 from django.db.models import DateTimeField
 from django.db.models import DurationField
 from django.db.models import FloatField
 from django.db.models import ForeignKey
 from django.db.models import ImageField
+from django.db.models import Index
+from django.db.models import JSONField
 from django.db.models import PositiveIntegerField
+from django.db.models import PositiveSmallIntegerField
 from django.db.models import TextChoices
 from django.db.models import TextField
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel
 from multiselectfield import MultiSelectField
 
+from gymlog.gym.fields import WeightField
 from gymlog.mixins import UUIDModel
+from gymlog.mixins import uuid7_timestamp
+
+# Rows owned by a user, routine or workout are removed by ON DELETE clauses in
+# the database (migration 0018) rather than by Django's deletion collector,
+# which would first load every child row into memory.
+DB_CASCADE = DO_NOTHING
+DB_SET_NULL = DO_NOTHING
 
 
 class Exercise(TimeStampedModel, UUIDModel):
@@ -115,7 +128,7 @@ class Exercise(TimeStampedModel, UUIDModel):
 class Routine(TimeStampedModel, UUIDModel):
     user = ForeignKey(
         settings.AUTH_USER_MODEL,
-        on_delete=CASCADE,
+        on_delete=DB_CASCADE,
         related_name="routines",
     )
     name = CharField(_("Name"), max_length=255)
@@ -130,7 +143,11 @@ class Routine(TimeStampedModel, UUIDModel):
 
 
 class RoutineExercise(TimeStampedModel, UUIDModel):
-    routine = ForeignKey(Routine, on_delete=CASCADE, related_name="routine_exercises")
+    routine = ForeignKey(
+        Routine,
+        on_delete=DB_CASCADE,
+        related_name="routine_exercises",
+    )
     order = PositiveIntegerField(_("Order"))
     exercise = ForeignKey(Exercise, on_delete=CASCADE)
     rest_timer = DurationField(
@@ -155,7 +172,7 @@ class RoutineExercise(TimeStampedModel, UUIDModel):
 class RoutineSet(TimeStampedModel, UUIDModel):
     routine_exercise = ForeignKey(
         RoutineExercise,
-        on_delete=CASCADE,
+        on_delete=DB_CASCADE,
         related_name="routine_sets",
     )
     order = PositiveIntegerField(_("Order"))
@@ -176,9 +193,14 @@ class RoutineSet(TimeStampedModel, UUIDModel):
 
 
 class Workout(TimeStampedModel, UUIDModel):
+    user = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=DB_CASCADE,
+        related_name="workouts",
+    )
     routine = ForeignKey(
         Routine,
-        on_delete=SET_NULL,
+        on_delete=DB_SET_NULL,
         null=True,
         blank=True,
         related_name="workouts",
@@ -186,48 +208,185 @@ class Workout(TimeStampedModel, UUIDModel):
     duration = DurationField(_("Duration"), blank=True, null=True)
     volume = FloatField(_("Volume"), blank=True, null=True, default=0.0)
     end = DateTimeField(_("End Time"), null=True, blank=True)
+    average_rest = DurationField(_("Average Rest"), blank=True, null=True)
+    density = FloatField(_("Density"), blank=True, null=True)
 
     class Meta:
         db_table = "workouts"
         verbose_name = _("Workout")
         verbose_name_plural = _("Workouts")
         ordering = ["-created"]
+        indexes = [
+            # Covers per-user calendars as index-only scans.
+            Index(
+                fields=["user", "-created"],
+                include=["volume"],
+                name="workouts_user_created_idx",
+            ),
+            # Finds the previous run of a routine for comparisons.
+            Index(fields=["routine", "-created"], name="workouts_routine_created_idx"),
+        ]
 
     def __str__(self):
         return f"Duration: {self.duration}, Volume: {self.volume} [ID={self.id}]"
 
 
 class ExerciseLog(TimeStampedModel, UUIDModel):
-    workout = ForeignKey(Workout, on_delete=CASCADE, related_name="exercise_logs")
+    # Leads the (workout, performed, order) unique index, which serves the
+    # lookups a separate index on workout_id would.
+    workout = ForeignKey(
+        Workout,
+        on_delete=DB_CASCADE,
+        related_name="exercise_logs",
+        db_index=False,
+    )
     exercise = ForeignKey(Exercise, on_delete=CASCADE)
-    order = PositiveIntegerField(_("Order"))
+    order = PositiveSmallIntegerField(_("Order"))
+    # Copy of ``workout.created`` and the partition key of exercise_logs once
+    # ``manage.py partition_logs`` has run.
+    performed = DateTimeField(_("Performed"), editable=False)
 
     class Meta:
         db_table = "exercise_logs"
         verbose_name = _("Exercise Log")
         verbose_name_plural = _("Exercise Logs")
-        unique_together = ("workout", "order")
+        # ``performed`` follows from ``workout``; it is only here because
+        # unique constraints of a partitioned table must include its key.
+        unique_together = ("workout", "performed", "order")
         ordering = ["order"]
 
     def __str__(self):
         return f"[ID={self.id}]"
 
+    # Not stored: the UUIDv7 key already records it.
+    @property
+    def created(self):
+        return uuid7_timestamp(self.id)
+
+    def save(self, *args, **kwargs):
+        if self.performed is None:
+            self.performed = self.workout.created
+        super().save(*args, **kwargs)
+
 
 class SetLog(TimeStampedModel, UUIDModel):
-    exercise_log = ForeignKey(ExerciseLog, on_delete=CASCADE, related_name="set_logs")
-    order = PositiveIntegerField(_("Order"))
-    weight = FloatField(_("Weight"))
-    reps = PositiveIntegerField(_("Reps"))
+    exercise_log = ForeignKey(
+        ExerciseLog,
+        on_delete=DB_CASCADE,
+        related_name="set_logs",
+        db_index=False,
+    )
+    order = PositiveSmallIntegerField(_("Order"))
+    weight = WeightField(_("Weight"))
+    reps = PositiveSmallIntegerField(_("Reps"))
     end = DateTimeField(_("End Time"), null=True, blank=True)
+    # Copy of ``exercise_log.performed``, the partition key of set_logs.
+    performed = DateTimeField(_("Performed"), editable=False)
 
     class Meta:
         db_table = "set_logs"
         verbose_name = _("Set Log")
         verbose_name_plural = _("Set Logs")
         ordering = ["order"]
-        unique_together = ("exercise_log", "order")
+        unique_together = ("exercise_log", "performed", "order")
 
     def __str__(self):
         return (
             f"#{self.order} - Weight: {self.weight}, Reps: {self.reps} [ID={self.id}]"
         )
+
+    @property
+    def created(self):
+        return uuid7_timestamp(self.id)
+
+    def save(self, *args, **kwargs):
+        if self.performed is None:
+            self.performed = self.exercise_log.performed
+        super().save(*args, **kwargs)
+
+
+class LastPerformance(TimeStampedModel, UUIDModel):
+    """The sets of the most recent workout in which a user did an exercise."""
+
+    user = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=DB_CASCADE,
+        related_name="last_performances",
+    )
+    exercise = ForeignKey(Exercise, on_delete=CASCADE, related_name="+")
+    # Cleared when the workout is archived; the hint itself stays.
+    workout = ForeignKey(
+        Workout,
+        on_delete=DB_SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    performed = DateTimeField(_("Performed"))
+    sets = JSONField(_("Sets"), default=list)
+
+    class Meta:
+        db_table = "last_performances"
+        verbose_name = _("Last Performance")
+        verbose_name_plural = _("Last Performances")
+        unique_together = ("user", "exercise")
+
+    def __str__(self):
+        return f"{self.exercise_id} @ {self.performed} [ID={self.id}]"
+
+
+class WeeklySummary(TimeStampedModel, UUIDModel):
+    """Training done by a user for one muscle group in one ISO week."""
+
+    user = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=DB_CASCADE,
+        related_name="weekly_summaries",
+    )
+    week = DateField(_("Week"))
+    muscle_group = CharField(
+        _("Muscle group"),
+        max_length=255,
+        choices=Exercise.MuscleGroups.choices,
+    )
+    sets = PositiveIntegerField(_("Sets"), default=0)
+    reps = PositiveIntegerField(_("Reps"), default=0)
+    volume = FloatField(_("Volume"), default=0.0)
+
+    class Meta:
+        db_table = "weekly_summaries"
+        verbose_name = _("Weekly Summary")
+        verbose_name_plural = _("Weekly Summaries")
+        unique_together = ("user", "week", "muscle_group")
+        ordering = ["week", "muscle_group"]
+
+    def __str__(self):
+        return f"{self.week} {self.muscle_group} [ID={self.id}]"
+
+
+class WorkoutArchive(TimeStampedModel, UUIDModel):
+    """Compressed workouts of one user for one month, out of the log tables.
+
+    A workout belongs to the month of the Monday of its ISO week, so archived
+    months always cover whole weeks.
+    """
+
+    user = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=DB_CASCADE,
+        related_name="workout_archives",
+    )
+    month = DateField(_("Month"))
+    workouts = PositiveIntegerField(_("Workouts"))
+    # zlib-compressed JSON list of WorkoutSerializer payloads.
+    data = BinaryField(_("Data"))
+
+    class Meta:
+        db_table = "workout_archives"
+        verbose_name = _("Workout Archive")
+        verbose_name_plural = _("Workout Archives")
+        unique_together = ("user", "month")
+        ordering = ["month"]
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.month:%Y-%m} [ID={self.id}]"
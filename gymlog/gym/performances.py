@@ -0,0 +1,163 @@
+"""Per-user "last time you did this exercise" hints.
+
+The latest sets of every exercise are kept in ``LastPerformance`` and
+mirrored in the cache, so a routine can show them for all of its exercises
+with a single ``get_many`` and, at most, one query for the misses.
+"""
+
+from django.core.cache import cache
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Prefetch
+
+from gymlog.gym.models import ExerciseLog
+from gymlog.gym.models import LastPerformance
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import Workout
+
+
+def _cache_key(user_id, exercise_id) -> str:
+    return f"gym:last-performance:{user_id}:{exercise_id}"
+
+
+def _as_hint(last_performance: LastPerformance) -> dict:
+    return {"performed": last_performance.performed, "sets": last_performance.sets}
+
+
+def _with_sets(exercise_logs):
+    return exercise_logs.prefetch_related(
+        Prefetch("set_logs", queryset=SetLog.objects.only("order", "weight", "reps")),
+    )
+
+
+def _sets_of(exercise_log: ExerciseLog) -> list[dict]:
+    return [
+        {"order": s.order, "weight": s.weight, "reps": s.reps}
+        for s in exercise_log.set_logs.all()
+    ]
+
+
+def _save(last_performances: list[LastPerformance]) -> None:
+    LastPerformance.objects.bulk_create(
+        last_performances,
+        update_conflicts=True,
+        unique_fields=["user", "exercise"],
+        update_fields=["workout", "performed", "sets", "modified"],
+    )
+    cache.set_many(
+        {
+            _cache_key(lp.user_id, lp.exercise_id): _as_hint(lp)
+            for lp in last_performances
+        },
+    )
+
+
+def update_last_performances(workout: Workout) -> None:
+    """Record the sets of ``workout`` unless a later workout already has.
+
+    Hints taken from ``workout`` for exercises it no longer has sets of fall
+    back to the user's previous workouts.
+    """
+    exercise_logs = _with_sets(ExerciseLog.objects.filter(workout=workout))
+    sets_by_exercise = {
+        exercise_log.exercise_id: _sets_of(exercise_log)
+        for exercise_log in exercise_logs
+    }
+    sets_by_exercise = {pk: sets for pk, sets in sets_by_exercise.items() if sets}
+    removed = LastPerformance.objects.filter(workout=workout).exclude(
+        exercise_id__in=sets_by_exercise,
+    )
+    _fall_back(workout, removed.values_list("exercise_id", flat=True))
+
+    newer = set(
+        LastPerformance.objects.filter(
+            user_id=workout.user_id,
+            exercise_id__in=sets_by_exercise,
+            performed__gt=workout.created,
+        ).values_list("exercise_id", flat=True),
+    )
+    last_performances = [
+        LastPerformance(
+            user_id=workout.user_id,
+            exercise_id=exercise_id,
+            workout=workout,
+            performed=workout.created,
+            sets=sets,
+        )
+        for exercise_id, sets in sets_by_exercise.items()
+        if exercise_id not in newer
+    ]
+    if last_performances:
+        _save(last_performances)
+
+
+def forget_last_performances(workout: Workout) -> None:
+    """Replace the hints taken from ``workout`` before it is deleted."""
+    exercise_ids = LastPerformance.objects.filter(workout=workout).values_list(
+        "exercise_id",
+        flat=True,
+    )
+    _fall_back(workout, exercise_ids)
+
+
+def _fall_back(workout: Workout, exercise_ids) -> None:
+    """Point the hints of ``exercise_ids`` at the latest workout but ``workout``.
+
+    Hints with no other workout to fall back to are removed.
+    """
+    exercise_ids = set(exercise_ids)
+    if not exercise_ids:
+        return
+    latest = _with_sets(
+        ExerciseLog.objects.filter(
+            Exists(SetLog.objects.filter(exercise_log=OuterRef("pk"))),
+            workout__user_id=workout.user_id,
+            exercise_id__in=exercise_ids,
+        )
+        .exclude(workout=workout)
+        .order_by("exercise_id", "-performed")
+        .distinct("exercise_id"),
+    )
+    last_performances = [
+        LastPerformance(
+            user_id=workout.user_id,
+            exercise_id=exercise_log.exercise_id,
+            workout_id=exercise_log.workout_id,
+            performed=exercise_log.performed,
+            sets=_sets_of(exercise_log),
+        )
+        for exercise_log in latest
+    ]
+    if last_performances:
+        _save(last_performances)
+
+    gone = exercise_ids - {lp.exercise_id for lp in last_performances}
+    if gone:
+        LastPerformance.objects.filter(
+            user_id=workout.user_id,
+            exercise_id__in=gone,
+        ).delete()
+        cache.set_many({_cache_key(workout.user_id, pk): None for pk in gone})
+
+
+def get_last_performances(user_id, exercise_ids) -> dict:
+    """Map each of ``exercise_ids`` to its last performance hint, if any."""
+    keys = {_cache_key(user_id, pk): pk for pk in exercise_ids}
+    cached = cache.get_many(keys)
+    hints = {keys[key]: hint for key, hint in cached.items()}
+
+    missing = [exercise_id for key, exercise_id in keys.items() if key not in cached]
+    if missing:
+        found = {
+            lp.exercise_id: _as_hint(lp)
+            for lp in LastPerformance.objects.filter(
+                user_id=user_id,
+                exercise_id__in=missing,
+            )
+        }
+        # Exercises never performed are cached as None to skip the query.
+        cache.set_many(
+            {_cache_key(user_id, pk): found.get(pk) for pk in missing},
+        )
+        hints.update(found)
+    return {pk: hint for pk, hint in hints.items() if hint is not None}
@@ -0,0 +1,138 @@
+"""Server-side operations on routines that would otherwise need a full payload."""
+
+from django.db.models import F
+from django.db.models import Max
+
+from gymlog import shards
+from gymlog.gym.models import ExerciseLog
+from gymlog.gym.models import Routine
+from gymlog.gym.models import RoutineExercise
+from gymlog.gym.models import RoutineSet
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import Workout
+
+
+@shards.atomic
+def start_workout(routine: Routine) -> Workout:
+    """Create a workout prefilled with the exercises and sets of ``routine``."""
+    # Rows are inserted in bulk rather than with INSERT ... SELECT so their
+    # keys stay application-generated, time-ordered UUIDv7s.
+    workout = Workout.objects.create(user_id=routine.user_id, routine=routine)
+
+    routine_exercises = list(
+        RoutineExercise.objects.filter(routine=routine).values_list(
+            "id",
+            "exercise_id",
+            "order",
+        ),
+    )
+    exercise_logs = ExerciseLog.objects.bulk_create(
+        ExerciseLog(
+            workout=workout,
+            exercise_id=exercise_id,
+            order=order,
+            performed=workout.created,
+        )
+        for _, exercise_id, order in routine_exercises
+    )
+    exercise_log_ids = {
+        routine_exercise_id: exercise_log.id
+        for (routine_exercise_id, _, _), exercise_log in zip(
+            routine_exercises,
+            exercise_logs,
+            strict=True,
+        )
+    }
+
+    SetLog.objects.bulk_create(
+        SetLog(
+            exercise_log_id=exercise_log_ids[routine_exercise_id],
+            order=order,
+            weight=weight,
+            reps=reps,
+            performed=workout.created,
+        )
+        for routine_exercise_id, order, weight, reps in RoutineSet.objects.filter(
+            routine_exercise__routine=routine,
+        ).values_list("routine_exercise_id", "order", "weight", "reps")
+    )
+    return workout
+
+
+@shards.atomic
+def duplicate_routine(routine: Routine, name: str | None = None) -> Routine:
+    """Copy ``routine`` with all of its exercises and sets."""
+    copy = Routine.objects.create(user_id=routine.user_id, name=name or routine.name)
+
+    routine_exercises = list(
+        RoutineExercise.objects.filter(routine=routine).values_list(
+            "id",
+            "exercise_id",
+            "order",
+            "rest_timer",
+            "note",
+        ),
+    )
+    copies = RoutineExercise.objects.bulk_create(
+        RoutineExercise(
+            routine=copy,
+            exercise_id=exercise_id,
+            order=order,
+            rest_timer=rest_timer,
+            note=note,
+        )
+        for _, exercise_id, order, rest_timer, note in routine_exercises
+    )
+    copy_ids = {
+        routine_exercise[0]: routine_exercise_copy.id
+        for routine_exercise, routine_exercise_copy in zip(
+            routine_exercises,
+            copies,
+            strict=True,
+        )
+    }
+
+    RoutineSet.objects.bulk_create(
+        RoutineSet(
+            routine_exercise_id=copy_ids[routine_exercise_id],
+            order=order,
+            weight=weight,
+            reps=reps,
+        )
+        for routine_exercise_id, order, weight, reps in RoutineSet.objects.filter(
+            routine_exercise__routine=routine,
+        ).values_list("routine_exercise_id", "order", "weight", "reps")
+    )
+    return copy
+
+
+@shards.atomic
+def reorder_routine(routine: Routine, routine_exercises) -> None:
+    """Renumber exercises and, optionally, their sets in the given order.
+
+    ``routine_exercises`` is a list of ``{"id": ..., "routine_sets": [...]}``
+    items; only the ``order`` columns are written.
+    """
+    RoutineExercise.objects.bulk_update(
+        [
+            RoutineExercise(id=item["id"], order=order)
+            for order, item in enumerate(routine_exercises, start=1)
+        ],
+        ["order"],
+    )
+
+    routine_sets = [
+        RoutineSet(id=routine_set_id, order=order)
+        for item in routine_exercises
+        for order, routine_set_id in enumerate(item.get("routine_sets", []), start=1)
+    ]
+    if not routine_sets:
+        return
+
+    # (routine_exercise, order) is unique and checked row by row, so sets are
+    # first shifted past both their current orders and the new ones, 1 to
+    # count, before getting their new order.
+    moved = RoutineSet.objects.filter(id__in=[s.id for s in routine_sets])
+    offset = moved.aggregate(offset=Max("order"))["offset"] + len(routine_sets) + 1
+    moved.update(order=F("order") + offset)
+    RoutineSet.objects.bulk_update(routine_sets, ["order"])
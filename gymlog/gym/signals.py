@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from gymlog.shards import copy_to_shards
+from gymlog.shards import delete_from_shards
+
+from .alternatives import invalidate_alternatives
+from .models import Exercise
+from .tasks import rebuild_exercise_alternatives
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_delete, sender=Exercise)
+def exercise_catalog_changed(sender, using, **kwargs):
+    if using != DEFAULT_DB_ALIAS:
+        return
+    invalidate_alternatives()
+    transaction.on_commit(rebuild_exercise_alternatives.delay)
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def global_row_saved(sender, instance, using, **kwargs):
+    if using == DEFAULT_DB_ALIAS:
+        copy_to_shards(instance)
+
+
+@receiver(post_delete, sender=Exercise)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def global_row_deleted(sender, instance, using, **kwargs):
+    if using == DEFAULT_DB_ALIAS:
+        delete_from_shards(instance)
@@ -0,0 +1,192 @@
+"""Progressive-overload suggestions for the next run of a routine.
+
+The last few sessions of every exercise in the routine are fetched with one
+windowed query and passed to the progression rule of the exercise type. The
+resulting workout draft is cached per user until their next workout write.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models import Window
+from django.db.models.functions import DenseRank
+
+from gymlog.gym.models import Exercise
+from gymlog.gym.models import Routine
+from gymlog.gym.models import RoutineExercise
+from gymlog.gym.models import RoutineSet
+from gymlog.gym.models import SetLog
+
+DOUBLE_PROGRESSION = "double_progression"
+ASSISTED_PROGRESSION = "assisted_progression"
+REPS_PROGRESSION = "reps_progression"
+REPEAT = "repeat"
+
+_WEIGHTED = {
+    "rule": DOUBLE_PROGRESSION,
+    "increment": 2.5,
+    "min_reps": 8,
+    "max_reps": 12,
+    "deload": 0.1,
+}
+_BODYWEIGHT = {"rule": REPS_PROGRESSION, "max_reps": 30}
+_ASSISTED = {
+    "rule": ASSISTED_PROGRESSION,
+    "increment": 5.0,
+    "min_reps": 6,
+    "max_reps": 12,
+}
+_REPEAT = {"rule": REPEAT}
+
+PROGRESSION_RULES = {
+    Exercise.ExerciseTypes.WEIGHT_REPS: _WEIGHTED,
+    Exercise.ExerciseTypes.WEIGHTED_BODYWEIGHT: _WEIGHTED,
+    Exercise.ExerciseTypes.SHORT_DISTANCE_WEIGHT: _WEIGHTED,
+    Exercise.ExerciseTypes.REPS_ONLY: _BODYWEIGHT,
+    Exercise.ExerciseTypes.BODYWEIGHT_REPS: _BODYWEIGHT,
+    Exercise.ExerciseTypes.ASSISTED_BODYWEIGHT: _ASSISTED,
+    Exercise.ExerciseTypes.BODYWEIGHT_ASSISTED_REPS: _ASSISTED,
+    Exercise.ExerciseTypes.DURATION: _REPEAT,
+    Exercise.ExerciseTypes.WEIGHT_DURATION: _REPEAT,
+    Exercise.ExerciseTypes.DISTANCE_DURATION: _REPEAT,
+    Exercise.ExerciseTypes.WEIGHT_DISTANCE: _REPEAT,
+}
+
+
+def _round_to(weight: float, increment: float) -> float:
+    return round(weight / increment) * increment
+
+
+def double_progression(sessions, *, increment, min_reps, max_reps, deload):
+    """Add reps up to ``max_reps``, then weight; deload after a stall.
+
+    A stall is every looked-at session being identical to the last one.
+    """
+    last = sessions[0]
+    if all(reps >= max_reps for _, reps in last):
+        return [(weight + increment, min_reps) for weight, _ in last]
+    if len(sessions) > 1 and all(session == last for session in sessions[1:]):
+        return [
+            (_round_to(weight * (1 - deload), increment), reps) for weight, reps in last
+        ]
+    return [(weight, min(reps + 1, max_reps)) for weight, reps in last]
+
+
+def assisted_progression(sessions, *, increment, min_reps, max_reps):
+    """Add reps up to ``max_reps``, then take assistance weight off."""
+    last = sessions[0]
+    if all(reps >= max_reps for _, reps in last):
+        return [(max(weight - increment, 0.0), min_reps) for weight, _ in last]
+    return [(weight, min(reps + 1, max_reps)) for weight, reps in last]
+
+
+def reps_progression(sessions, *, max_reps):
+    return [(weight, min(reps + 1, max_reps)) for weight, reps in sessions[0]]
+
+
+def repeat(sessions):
+    return list(sessions[0])
+
+
+RULES = {
+    DOUBLE_PROGRESSION: double_progression,
+    ASSISTED_PROGRESSION: assisted_progression,
+    REPS_PROGRESSION: reps_progression,
+    REPEAT: repeat,
+}
+
+
+def progress_sets(exercise_type, sessions) -> list[tuple[float, int]]:
+    """Next sets from ``sessions`` of ``(weight, reps)`` lists, newest first."""
+    params = dict(
+        settings.WORKOUT_PROGRESSION_RULES.get(exercise_type)
+        or PROGRESSION_RULES.get(exercise_type, _REPEAT),
+    )
+    return RULES[params.pop("rule")](sessions, **params)
+
+
+def _version_key(user_id) -> str:
+    return f"gym:suggestions-version:{user_id}"
+
+
+def invalidate_suggestions(user_id) -> None:
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), 1, None)
+
+
+def _history(user_id, exercise_ids, sessions) -> dict:
+    """``{exercise_id: [[(weight, reps), ...], ...]}``, newest session first."""
+    rows = (
+        SetLog.objects.filter(
+            exercise_log__workout__user_id=user_id,
+            exercise_log__exercise_id__in=exercise_ids,
+        )
+        .annotate(
+            exercise=F("exercise_log__exercise_id"),
+            session=Window(
+                DenseRank(),
+                partition_by=F("exercise_log__exercise_id"),
+                order_by=F("exercise_log__workout__created").desc(),
+            ),
+        )
+        .filter(session__lte=sessions)
+        .order_by("exercise", "session", "exercise_log__order", "order")
+        .values_list("exercise", "session", "weight", "reps")
+    )
+    history = {}
+    for exercise_id, session, weight, reps in rows:
+        exercise_sessions = history.setdefault(exercise_id, [])
+        if len(exercise_sessions) < session:
+            exercise_sessions.append([])
+        exercise_sessions[-1].append((weight, reps))
+    return history
+
+
+def _suggest(routine: Routine) -> dict:
+    routine_exercises = list(
+        RoutineExercise.objects.filter(routine=routine)
+        .order_by("order")
+        .values_list("id", "order", "exercise_id", "exercise__exercise_type"),
+    )
+    planned = {}
+    for routine_exercise_id, weight, reps in RoutineSet.objects.filter(
+        routine_exercise__routine=routine,
+    ).values_list("routine_exercise_id", "weight", "reps"):
+        planned.setdefault(routine_exercise_id, []).append((weight, reps))
+    history = _history(
+        routine.user_id,
+        [exercise_id for _, _, exercise_id, _ in routine_exercises],
+        settings.WORKOUT_PROGRESSION_SESSIONS,
+    )
+
+    exercise_logs = []
+    for routine_exercise_id, order, exercise_id, exercise_type in routine_exercises:
+        sessions = history.get(exercise_id)
+        if sessions:
+            sets = progress_sets(exercise_type, sessions)
+        else:
+            sets = planned.get(routine_exercise_id, [])
+        exercise_logs.append(
+            {
+                "order": order,
+                "exercise_id": str(exercise_id),
+                "set_logs": [
+                    {"order": set_order, "weight": weight, "reps": reps}
+                    for set_order, (weight, reps) in enumerate(sets, start=1)
+                ],
+            },
+        )
+    return {"routine_id": str(routine.id), "exercise_logs": exercise_logs}
+
+
+def suggest_workout(routine: Routine) -> dict:
+    """A ``WorkoutSerializer`` draft of ``routine`` with progressed sets."""
+    version = cache.get_or_set(_version_key(routine.user_id), 1, None)
+    key = f"gym:suggestions:{routine.id}"
+    draft = cache.get(key, version=version)
+    if draft is None:
+        draft = _suggest(routine)
+        cache.set(key, draft, version=version)
+    return draft
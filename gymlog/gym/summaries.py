@@ -0,0 +1,142 @@
+"""Weekly per-muscle-group training summaries.
+
+A set counts towards the primary muscle group of its exercise and towards
+each of the exercise's other muscles.
+"""
+
+from collections import defaultdict
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Max
+from django.db.models import Q
+from django.db.models import Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from gymlog import shards
+from gymlog.gym.fields import volume
+from gymlog.gym.models import Exercise
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import WeeklySummary
+from gymlog.gym.models import Workout
+from gymlog.gym.models import WorkoutArchive
+
+
+def week_of(moment: datetime) -> date:
+    """Monday of the ISO week that ``moment`` falls in."""
+    day = timezone.localdate(moment)
+    return day - timedelta(days=day.weekday())
+
+
+def first_week_of_month(month: date) -> date:
+    """The first Monday on or after the first day of ``month``."""
+    return month + timedelta(days=-month.weekday() % 7)
+
+
+def archived_until(user_ids) -> dict:
+    """First week not yet archived, for the users with archived workouts.
+
+    Summaries of earlier weeks can no longer be recomputed from the log
+    tables, so they are kept as they are.
+    """
+    return {
+        user_id: first_week_of_month(_next_month(month))
+        for user_id, month in WorkoutArchive.objects.filter(user_id__in=user_ids)
+        .values("user_id")
+        .annotate(month=Max("month"))
+        .values_list("user_id", "month")
+    }
+
+
+def _next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _week_start(week: date) -> datetime:
+    return timezone.make_aware(datetime.combine(week, time.min))
+
+
+def _summarize(user_id, weeks=None) -> list[WeeklySummary]:
+    set_logs = SetLog.objects.filter(exercise_log__workout__user_id=user_id)
+    if weeks is not None:
+        set_logs = set_logs.filter(
+            exercise_log__workout__created__gte=_week_start(min(weeks)),
+            exercise_log__workout__created__lt=_week_start(max(weeks))
+            + timedelta(weeks=1),
+        )
+    rows = list(
+        set_logs.values(
+            exercise_id=F("exercise_log__exercise_id"),
+            week=TruncWeek("exercise_log__workout__created"),
+        ).annotate(
+            set_count=Count("id"),
+            rep_count=Sum("reps"),
+            total_volume=Sum(volume()),
+        ),
+    )
+    muscles = {
+        pk: {primary, *other}
+        for pk, primary, other in Exercise.objects.filter(
+            id__in={row["exercise_id"] for row in rows},
+        ).values_list("id", "primary_muscle_group", "other_muscles")
+    }
+
+    totals = defaultdict(lambda: {"sets": 0, "reps": 0, "volume": 0.0})
+    for row in rows:
+        week = row["week"].date()
+        if weeks is not None and week not in weeks:
+            continue
+        for muscle_group in muscles[row["exercise_id"]]:
+            total = totals[week, muscle_group]
+            total["sets"] += row["set_count"]
+            total["reps"] += row["rep_count"]
+            total["volume"] += row["total_volume"]
+
+    return [
+        WeeklySummary(user_id=user_id, week=week, muscle_group=muscle_group, **total)
+        for (week, muscle_group), total in totals.items()
+    ]
+
+
+@shards.atomic
+def refresh_weekly_summaries(user_id, weeks) -> None:
+    """Recompute the summaries of ``user_id`` for the given ISO ``weeks``."""
+    frozen_until = archived_until([user_id]).get(user_id)
+    weeks = {week for week in weeks if frozen_until is None or week >= frozen_until}
+    if not weeks:
+        return
+    WeeklySummary.objects.filter(user_id=user_id, week__in=weeks).delete()
+    WeeklySummary.objects.bulk_create(_summarize(user_id, weeks))
+
+
+def refresh_workout_week(workout: Workout) -> None:
+    refresh_weekly_summaries(workout.user_id, [week_of(workout.created)])
+
+
+def refresh_workout_week_on_commit(workout: Workout) -> None:
+    """``refresh_workout_week`` once the current transaction has committed."""
+    database = shards.current_database()
+
+    def refresh():
+        with shards.use_database(database):
+            refresh_workout_week(workout)
+
+    transaction.on_commit(refresh, using=database)
+
+
+@shards.atomic
+def rebuild_weekly_summaries(user_ids) -> None:
+    """Recompute every summary of the given users from scratch."""
+    stale = Q(user_id__in=user_ids)
+    for user_id, frozen_until in archived_until(user_ids).items():
+        stale &= ~Q(user_id=user_id, week__lt=frozen_until)
+    WeeklySummary.objects.filter(stale).delete()
+    WeeklySummary.objects.bulk_create(
+        summary for user_id in user_ids for summary in _summarize(user_id)
+    )
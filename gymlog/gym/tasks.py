@@ -0,0 +1,88 @@
+from collections import defaultdict
+
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from gymlog.shards import database_for
+from gymlog.shards import use_database
+
+from . import summaries
+from .alternatives import rebuild_alternatives
+from .archive import archive_user
+from .drafts import flush_drafts
+from .models import Routine
+from .models import Workout
+
+SUMMARY_REBUILD_CHUNK_SIZE = 500
+ARCHIVE_CHUNK_SIZE = 100
+ACCOUNT_DELETE_BATCH_SIZE = 200
+
+
+@shared_task()
+def flush_workout_drafts():
+    """Persist autosaved workout drafts buffered in the cache."""
+    return flush_drafts()
+
+
+@shared_task()
+def rebuild_weekly_summaries(after=None):
+    """Rebuild weekly summaries for one chunk of users, then queue the next."""
+    users = get_user_model().objects.order_by("pk").values_list("pk", flat=True)
+    if after is not None:
+        users = users.filter(pk__gt=after)
+    user_ids = list(users[:SUMMARY_REBUILD_CHUNK_SIZE])
+
+    by_database = defaultdict(list)
+    for user_id in user_ids:
+        by_database[database_for(user_id)].append(user_id)
+    for database, ids in by_database.items():
+        with use_database(database):
+            summaries.rebuild_weekly_summaries(ids)
+    if len(user_ids) == SUMMARY_REBUILD_CHUNK_SIZE:
+        rebuild_weekly_summaries.delay(after=str(user_ids[-1]))
+    return len(user_ids)
+
+
+@shared_task()
+def rebuild_exercise_alternatives():
+    """Recompute the exercise similarity matrix after a catalog change."""
+    return rebuild_alternatives()
+
+
+@shared_task()
+def archive_workouts(after=None):
+    """Archive the old workouts of one chunk of users, then queue the next."""
+    if not settings.WORKOUT_ARCHIVE_AFTER_MONTHS:
+        return 0
+    users = get_user_model().objects.order_by("pk").values_list("pk", flat=True)
+    if after is not None:
+        users = users.filter(pk__gt=after)
+    user_ids = list(users[:ARCHIVE_CHUNK_SIZE])
+
+    archived = 0
+    for user_id in user_ids:
+        with use_database(database_for(user_id)):
+            archived += archive_user(user_id)
+    if len(user_ids) == ARCHIVE_CHUNK_SIZE:
+        archive_workouts.delay(after=str(user_ids[-1]))
+    return archived
+
+
+@shared_task()
+def delete_account(user_id):
+    """Delete a user's gym data one batch per task, then the user.
+
+    The database cascades each batch down to the logs and sets, so no batch
+    holds locks on more than ``ACCOUNT_DELETE_BATCH_SIZE`` workouts' rows.
+    """
+    with use_database(database_for(user_id)):
+        for model in (Workout, Routine):
+            owned = model.objects.filter(user_id=user_id).values_list("pk", flat=True)
+            pks = list(owned[:ACCOUNT_DELETE_BATCH_SIZE])
+            if pks:
+                model.objects.filter(pk__in=pks).delete()
+                delete_account.delay(user_id)
+                return False
+    get_user_model().objects.filter(pk=user_id).delete()
+    return True
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from gymlog.gym.analytics import BRZYCKI
+from gymlog.gym.analytics import SECONDS_PER_DAY
+from gymlog.gym.analytics import downsample
+from gymlog.gym.analytics import estimated_one_rep_max
+from gymlog.gym.analytics import progress
+from gymlog.gym.analytics import rolling_sum
+
+
+def test_estimated_one_rep_max():
+    weight = np.array([100.0, 100.0, 100.0])
+    reps = np.array([1, 10, 40])
+
+    assert estimated_one_rep_max(weight, reps) == pytest.approx(
+        [100.0, 100 * (1 + 10 / 30), 100 * (1 + 40 / 30)],
+    )
+    brzycki = estimated_one_rep_max(weight, reps, BRZYCKI)
+    assert brzycki[:2] == pytest.approx([100.0, 100 * 36 / 27])
+    assert np.isnan(brzycki[2])
+
+
+def test_rolling_sum():
+    epoch = np.array([0, 1, 2, 10]) * SECONDS_PER_DAY
+
+    assert rolling_sum(epoch, np.ones(4), 2) == pytest.approx([1, 2, 2, 1])
+
+
+def test_progress():
+    epoch = np.array([0, 0, 7, 7, 14]) * float(SECONDS_PER_DAY)
+    weight = np.array([100.0, 90.0, 105.0, 100.0, 110.0])
+    reps = np.ones(5)
+
+    result = progress((epoch, weight, reps), window_days=7)
+    assert [p["e1rm"] for p in result["points"]] == [100.0, 105.0, 110.0]
+    assert [p["volume"] for p in result["points"]] == [190.0, 205.0, 110.0]
+    assert [p["rolling_volume"] for p in result["points"]] == [190.0, 205.0, 110.0]
+    assert result["trend"]["slope_per_week"] == pytest.approx(5.0)
+
+
+def test_progress_empty():
+    empty = np.array([])
+
+    assert progress((empty, empty, empty)) == {"points": [], "trend": None}
+
+
+def test_downsample():
+    budget = 50
+    peak = 123
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50)
+    y[peak] = 10.0
+
+    keep = downsample(x, y, budget)
+    assert len(keep) == budget
+    assert keep[0] == 0
+    assert keep[-1] == len(x) - 1
+    assert peak in keep
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_downsample_within_budget():
+    x = np.arange(10, dtype=np.float64)
+
+    assert downsample(x, x, 20).tolist() == list(range(10))
+
+
+def test_progress_points():
+    budget = 10
+    best_weight = 150.0
+    epoch = np.arange(100) * float(SECONDS_PER_DAY)
+    weight = np.full(100, 100.0)
+    weight[40] = best_weight
+
+    result = progress((epoch, weight, np.ones(100)), points=budget)
+    assert len(result["points"]) == budget
+    assert max(p["e1rm"] for p in result["points"]) == best_weight
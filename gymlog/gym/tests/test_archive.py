@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from gymlog.gym.models import LastPerformance
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import WeeklySummary
+from gymlog.gym.models import Workout
+from gymlog.gym.models import WorkoutArchive
+from gymlog.gym.performances import update_last_performances
+from gymlog.gym.summaries import rebuild_weekly_summaries
+from gymlog.gym.summaries import refresh_workout_week
+from gymlog.gym.tasks import archive_workouts
+from gymlog.gym.training_calendar import training_calendar
+from gymlog.users.models import User
+
+STATUS_OK = 200
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def old_workout(workout: Workout) -> Workout:
+    Workout.objects.filter(pk=workout.pk).update(
+        created=timezone.now() - timedelta(days=2 * 365),
+    )
+    workout.refresh_from_db()
+    refresh_workout_week(workout)
+    update_last_performances(workout)
+    return workout
+
+
+def _summaries(user):
+    return list(
+        WeeklySummary.objects.filter(user=user)
+        .order_by("week", "muscle_group")
+        .values_list("week", "muscle_group", "sets", "reps", "volume"),
+    )
+
+
+def test_archive_workouts(
+    settings,
+    user: User,
+    api_client: APIClient,
+    old_workout: Workout,
+):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.WORKOUT_ARCHIVE_AFTER_MONTHS = 12
+    api_client.force_authenticate(user=user)
+    history_url = reverse("api:workout-history")
+    history = api_client.get(history_url).json()
+    summaries = _summaries(user)
+    assert [workout["id"] for workout in history] == [str(old_workout.id)]
+    assert summaries
+
+    assert archive_workouts.delay().result == 1
+
+    assert not Workout.objects.filter(pk=old_workout.pk).exists()
+    assert not SetLog.objects.filter(exercise_log__workout=old_workout).exists()
+    archive = WorkoutArchive.objects.get(user=user)
+    assert archive.workouts == 1
+    assert LastPerformance.objects.filter(user=user, workout=None).exists()
+
+    rebuild_weekly_summaries([user.id])
+    assert _summaries(user) == summaries
+
+    response = api_client.get(history_url)
+    assert response.status_code == STATUS_OK
+    assert response.json() == history
+
+    response = api_client.get(reverse("api:workout-export"))
+    assert response.status_code == STATUS_OK
+    assert response.json() == history
+    assert "workouts.json" in response["Content-Disposition"]
+
+    # Nothing is left to archive.
+    assert archive_workouts.delay().result == 0
+
+
+def test_archive_workouts_off_by_default(settings, old_workout: Workout):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    assert archive_workouts.delay().result == 0
+    assert Workout.objects.filter(pk=old_workout.pk).exists()
+
+
+def test_archive_workouts_refreshes_calendar(
+    settings,
+    user: User,
+    old_workout: Workout,
+):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.WORKOUT_ARCHIVE_AFTER_MONTHS = 12
+    assert training_calendar(user.id)["days"]
+
+    archive_workouts.delay()
+
+    assert training_calendar(user.id)["days"] == []
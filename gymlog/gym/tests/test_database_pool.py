@@ -0,0 +1,58 @@
+import pytest
+from django.db import connections
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from gymlog.db.postgresql.base import DatabaseWrapper
+from gymlog.users.models import User
+from gymlog.users.tests.factories import UserFactory
+
+STATUS_OK = 200
+STATUS_FORBIDDEN = 403
+
+
+@pytest.fixture()
+def pooled_connection(db):
+    settings_dict = connections["default"].settings_dict
+    connection = DatabaseWrapper(
+        {
+            **settings_dict,
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                **settings_dict["OPTIONS"],
+                "pool": {"min_size": 1, "max_size": 1},
+            },
+        },
+        alias="pooled",
+    )
+    yield connection
+    connection.close()
+    connection.close_pool()
+
+
+def test_pooled_connections_are_reused(pooled_connection):
+    backend_pids = []
+    for _ in range(2):
+        with pooled_connection.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            backend_pids.append(cursor.fetchone()[0])
+        pooled_connection.close()
+
+    assert backend_pids[0] == backend_pids[1]
+    assert pooled_connection.pool.get_stats()["pool_size"] == 1
+
+
+def test_database_pool_stats(pooled_connection, api_client: APIClient, user: User):
+    pooled_connection.ensure_connection()
+    url = reverse("api-database-pools")
+
+    api_client.force_authenticate(user=user)
+    assert api_client.get(url).status_code == STATUS_FORBIDDEN
+
+    api_client.force_authenticate(user=UserFactory(is_staff=True))
+    response = api_client.get(url)
+    assert response.status_code == STATUS_OK
+    stats = response.json()["pooled"]
+    assert stats["waitCount"] >= 1
+    assert stats["poolMax"] == 1
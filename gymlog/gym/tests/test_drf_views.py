@@ -2,17 +2,24 @@ from datetime import timedelta
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.urls import reverse
 from rest_framework.test import APIClient
 
 from gymlog.gym.models import Exercise
 from gymlog.gym.models import Routine
+from gymlog.gym.models import RoutineSet
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import WeeklySummary
 from gymlog.gym.models import Workout
 from gymlog.gym.tests.factories import ExerciseFactory
+from gymlog.gym.tests.factories import RoutineExerciseFactory
 from gymlog.users.models import User
+from gymlog.users.tests.factories import UserFactory
 
 STATUS_OK = 200
 STATUS_CREATED = 201
+STATUS_ACCEPTED = 202
 STATUS_NO_CONTENT = 204
 STATUS_BAD_REQUEST = 400
 STATUS_NOT_FOUND = 404
@@ -42,6 +49,32 @@ class TestWorkoutViewSet:
         for exercise_log in workout_data["exerciseLogs"]:
             assert len(exercise_log["setLogs"]) == set_logs_count
 
+    def test_get_workout_of_another_user(
+        self,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=UserFactory())
+        url = reverse("api:workout-detail", kwargs={"pk": workout.id})
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_NOT_FOUND
+
+    def test_workout_kept_after_routine_deleted(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        workout.routine.delete()
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-list")
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        assert [w["id"] for w in response.json()] == [str(workout.id)]
+
     def test_update_workout_invalid_data(
         self,
         user: User,
@@ -484,6 +517,274 @@ class TestWorkoutViewSet:
         assert set_logs_2[1].weight == pytest.approx(new_weight_2 + 5)
         assert set_logs_2[1].reps == new_reps_2 + 2
 
+    def test_workout_draft(self, user: User, api_client: APIClient, workout: Workout):
+        new_volume = 500.0
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-draft", kwargs={"pk": workout.id})
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_NOT_FOUND
+
+        draft = {
+            "duration": "00:10:00",
+            "volume": new_volume,
+            "routineId": str(workout.routine.id),
+            "exerciseLogs": [],
+        }
+        response = api_client.put(url, draft, format="json")
+        assert response.status_code == STATUS_ACCEPTED
+        assert response.json()["revision"] == 1
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        assert response.json()["volume"] == new_volume
+
+        workout.refresh_from_db()
+        assert workout.volume != pytest.approx(new_volume)
+        assert workout.exercise_logs.exists()
+
+        url = reverse("api:workout-finish", kwargs={"pk": workout.id})
+        response = api_client.post(url)
+        assert response.status_code == STATUS_OK
+        assert response.json()["exerciseLogs"] == []
+
+        workout.refresh_from_db()
+        assert workout.volume == pytest.approx(new_volume)
+        assert not workout.exercise_logs.exists()
+
+        url = reverse("api:workout-draft", kwargs={"pk": workout.id})
+        response = api_client.get(url)
+        assert response.status_code == STATUS_NOT_FOUND
+
+    def test_finish_workout_derives_end_and_duration(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        workout.duration = None
+        workout.save()
+        first_end = workout.created + timedelta(minutes=5)
+        last_end = workout.created + timedelta(minutes=50)
+        exercise_log = workout.exercise_logs.get(order=1)
+        exercise_log.set_logs.filter(order=1).update(end=first_end)
+        exercise_log.set_logs.filter(order=3).update(end=last_end)
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-finish", kwargs={"pk": workout.id})
+
+        response = api_client.post(url)
+        assert response.status_code == STATUS_OK
+        assert response.json()["duration"] == "00:45:00"
+
+        workout.refresh_from_db()
+        assert workout.end == last_end
+        assert workout.duration == last_end - first_end
+
+    def test_workout_calendar(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        yesterday = workout.created - timedelta(days=1)
+        Workout.objects.filter(id=workout.id).update(created=yesterday)
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-calendar")
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        calendar = response.json()
+        assert calendar["days"] == [
+            {"date": yesterday.date().isoformat(), "workouts": 1, "volume": 100.0},
+        ]
+        assert calendar["currentStreak"] == 1
+        assert calendar["longestStreak"] == 1
+
+        start_url = reverse("api:routine-start", kwargs={"pk": workout.routine_id})
+        assert api_client.post(start_url).status_code == STATUS_CREATED
+
+        calendar = api_client.get(url).json()
+        assert len(calendar["days"]) == len(["yesterday", "today"])
+        assert calendar["currentStreak"] == len(["yesterday", "today"])
+
+        response = api_client.get(url, {"from": calendar["days"][1]["date"]})
+        assert len(response.json()["days"]) == 1
+
+    def test_compare_workout(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        set_logs_count = 3
+        volume = 300.0
+        previous_volume = 50.0
+        previous = Workout.objects.create(user=user, routine=workout.routine)
+        Workout.objects.filter(id=previous.id).update(
+            created=workout.created - timedelta(days=2),
+        )
+        exercise_log = workout.exercise_logs.get(order=1)
+        previous_log = previous.exercise_logs.create(
+            exercise_id=exercise_log.exercise_id,
+            order=1,
+        )
+        previous_log.set_logs.create(order=1, weight=previous_volume, reps=1)
+        exercise_log.set_logs.update(weight=10.0, reps=10)
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-compare", kwargs={"pk": workout.id})
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        comparison = response.json()
+        assert comparison["previous"] == str(previous.id)
+
+        first, second = comparison["exercises"]
+        assert first["exerciseId"] == str(exercise_log.exercise_id)
+        assert first["sets"] == set_logs_count
+        assert first["previousSets"] == 1
+        assert first["setsDelta"] == set_logs_count - 1
+        assert first["volume"] == pytest.approx(volume)
+        assert first["volumeDelta"] == pytest.approx(volume - previous_volume)
+        assert second["previousSets"] == 0
+        assert second["previousVolume"] == 0
+
+    def test_compare_first_workout(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-compare", kwargs={"pk": workout.id})
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        comparison = response.json()
+        assert comparison["previous"] is None
+        assert [e["previousSets"] for e in comparison["exercises"]] == [0, 0]
+
+    def test_workout_draft_invalid_data(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-draft", kwargs={"pk": workout.id})
+
+        response = api_client.put(url, {"volume": "invalid"}, format="json")
+        assert response.status_code == STATUS_BAD_REQUEST
+
+    def test_batch_set_logs(self, user: User, api_client: APIClient, workout: Workout):
+        new_weight = 100.0
+        new_reps = 5
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-sets", kwargs={"pk": workout.id})
+
+        payload = [
+            {"exerciseOrder": 1, "order": 1, "weight": new_weight, "reps": new_reps},
+            {"exerciseOrder": 1, "order": 4, "weight": new_weight, "reps": new_reps},
+            {"exerciseOrder": 2, "order": 4, "weight": new_weight, "reps": new_reps},
+        ]
+        response = api_client.post(url, payload, format="json")
+        assert response.status_code == STATUS_OK
+
+        got_set_logs = response.json()
+        assert [(s["exerciseOrder"], s["order"]) for s in got_set_logs] == [
+            (1, 1),
+            (1, 4),
+            (2, 4),
+        ]
+
+        exercise_log_1 = workout.exercise_logs.get(order=1)
+        assert exercise_log_1.set_logs.count() == len(payload) + 1
+        set_log = exercise_log_1.set_logs.get(order=1)
+        assert set_log.weight == pytest.approx(new_weight)
+        assert set_log.reps == new_reps
+        assert workout.exercise_logs.get(order=2).set_logs.filter(order=4).exists()
+
+    def test_batch_set_logs_discard_draft(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=user)
+        draft_url = reverse("api:workout-draft", kwargs={"pk": workout.id})
+        draft = {
+            "duration": "00:10:00",
+            "volume": 500.0,
+            "routineId": str(workout.routine.id),
+            "exerciseLogs": [],
+        }
+        response = api_client.put(draft_url, draft, format="json")
+        assert response.status_code == STATUS_ACCEPTED
+
+        url = reverse("api:workout-sets", kwargs={"pk": workout.id})
+        payload = [{"exerciseOrder": 1, "order": 4, "weight": 90.0, "reps": 6}]
+        assert api_client.post(url, payload, format="json").status_code == STATUS_OK
+
+        url = reverse("api:workout-finish", kwargs={"pk": workout.id})
+        assert api_client.post(url).status_code == STATUS_OK
+        exercise_log = workout.exercise_logs.get(order=1)
+        assert exercise_log.set_logs.filter(order=4, reps=6).exists()
+        assert api_client.get(draft_url).status_code == STATUS_NOT_FOUND
+
+    def test_batch_set_logs_keep_end(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        end = workout.created + timedelta(minutes=3)
+        set_log = workout.exercise_logs.get(order=1).set_logs.get(order=1)
+        SetLog.objects.filter(pk=set_log.pk).update(end=end)
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-sets", kwargs={"pk": workout.id})
+
+        payload = [{"exerciseOrder": 1, "order": 1, "weight": 90.0, "reps": 6}]
+        assert api_client.post(url, payload, format="json").status_code == STATUS_OK
+        set_log.refresh_from_db()
+        assert set_log.end == end
+        assert set_log.reps == payload[0]["reps"]
+
+        payload[0]["end"] = None
+        assert api_client.post(url, payload, format="json").status_code == STATUS_OK
+        set_log.refresh_from_db()
+        assert set_log.end is None
+
+    def test_batch_set_logs_unknown_exercise(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-sets", kwargs={"pk": workout.id})
+
+        payload = [{"exerciseOrder": 9, "order": 1, "weight": 10.0, "reps": 5}]
+        response = api_client.post(url, payload, format="json")
+        assert response.status_code == STATUS_BAD_REQUEST
+
+    def test_batch_set_logs_duplicates(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-sets", kwargs={"pk": workout.id})
+
+        payload = [{"exerciseOrder": 1, "order": 1, "weight": 10.0, "reps": 5}] * 2
+        response = api_client.post(url, payload, format="json")
+        assert response.status_code == STATUS_BAD_REQUEST
+
 
 class TestRoutineViewSet:
     def test_get_routine_list(
@@ -525,6 +826,85 @@ class TestRoutineViewSet:
             routine_set_count = routine.routine_exercises.last().routine_sets.count()
             assert len(routine_exercise["routineSets"]) == routine_set_count
 
+    def test_get_routine_detail_last_performance(
+        self,
+        user: User,
+        api_client: APIClient,
+        routine: Routine,
+    ):
+        routine_exercise = routine.routine_exercises.get()
+        workout = Workout.objects.create(user=user, routine=routine)
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-detail", kwargs={"pk": workout.id})
+        response = api_client.put(
+            url,
+            {
+                "routineId": str(routine.id),
+                "exerciseLogs": [
+                    {
+                        "order": 1,
+                        "exerciseId": str(routine_exercise.exercise_id),
+                        "setLogs": [{"order": 1, "weight": 80.0, "reps": 8}],
+                    },
+                ],
+            },
+            format="json",
+        )
+        assert response.status_code == STATUS_OK
+
+        url = reverse("api:routine-detail", kwargs={"pk": routine.id})
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+
+        last_performance = response.json()["routineExercises"][0]["lastPerformance"]
+        assert last_performance["sets"] == [{"order": 1, "weight": 80.0, "reps": 8}]
+
+    def test_last_performance_follows_removed_workouts(
+        self,
+        user: User,
+        api_client: APIClient,
+        routine: Routine,
+    ):
+        routine_exercise = routine.routine_exercises.get()
+        api_client.force_authenticate(user=user)
+        routine_url = reverse("api:routine-detail", kwargs={"pk": routine.id})
+
+        def log_workout(weight):
+            workout = Workout.objects.create(user=user, routine=routine)
+            exercise_logs = [
+                {
+                    "order": 1,
+                    "exerciseId": str(routine_exercise.exercise_id),
+                    "setLogs": [{"order": 1, "weight": weight, "reps": 8}],
+                },
+            ]
+            url = reverse("api:workout-detail", kwargs={"pk": workout.id})
+            payload = {"routineId": str(routine.id), "exerciseLogs": exercise_logs}
+            assert api_client.put(url, payload, format="json").status_code == (
+                STATUS_OK
+            )
+            return url
+
+        def last_weight():
+            response = api_client.get(routine_url)
+            last_performance = response.json()["routineExercises"][0]["lastPerformance"]
+            return last_performance and last_performance["sets"][0]["weight"]
+
+        first_url = log_workout(80.0)
+        second_url = log_workout(85.0)
+        assert last_weight() == pytest.approx(85.0)
+
+        # The exercise is dropped from the latest workout.
+        payload = {"routineId": str(routine.id), "exerciseLogs": []}
+        assert api_client.put(second_url, payload, format="json").status_code == (
+            STATUS_OK
+        )
+        assert last_weight() == pytest.approx(80.0)
+
+        assert api_client.delete(first_url).status_code == STATUS_NO_CONTENT
+        assert last_weight() is None
+
     def test_create_routine(self, user: User, api_client: APIClient):
         api_client.force_authenticate(user=user)
         url = reverse("api:routine-list")
@@ -613,6 +993,259 @@ class TestRoutineViewSet:
         with pytest.raises(Routine.DoesNotExist):
             routine.refresh_from_db()
 
+    def test_start_workout(self, user: User, api_client: APIClient, routine: Routine):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:routine-start", kwargs={"pk": routine.id})
+
+        response = api_client.post(url)
+        assert response.status_code == STATUS_CREATED
+
+        workout_data = response.json()
+        assert workout_data["routineId"] == str(routine.id)
+
+        workout = user.workouts.get(id=workout_data["id"])
+
+        routine_exercise = routine.routine_exercises.get()
+        exercise_log = workout.exercise_logs.get()
+        assert exercise_log.exercise_id == routine_exercise.exercise_id
+        assert exercise_log.order == routine_exercise.order
+        assert list(exercise_log.set_logs.values_list("order", "weight", "reps")) == (
+            list(routine_exercise.routine_sets.values_list("order", "weight", "reps"))
+        )
+
+    def test_routine_suggestions(
+        self,
+        user: User,
+        api_client: APIClient,
+        routine: Routine,
+    ):
+        weight = 60.0
+        max_reps = 12
+        routine_exercise = routine.routine_exercises.get()
+        Exercise.objects.filter(id=routine_exercise.exercise_id).update(
+            exercise_type=Exercise.ExerciseTypes.WEIGHT_REPS,
+        )
+        workout = Workout.objects.create(user=user, routine=routine)
+        exercise_log = workout.exercise_logs.create(
+            exercise_id=routine_exercise.exercise_id,
+            order=1,
+        )
+        for order in (1, 2):
+            exercise_log.set_logs.create(order=order, weight=weight, reps=max_reps)
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:routine-suggestions", kwargs={"pk": routine.id})
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        draft = response.json()
+        assert draft["routineId"] == str(routine.id)
+        assert draft["exerciseLogs"][0]["exerciseId"] == str(
+            routine_exercise.exercise_id,
+        )
+        assert [
+            (s["order"], s["weight"], s["reps"])
+            for s in draft["exerciseLogs"][0]["setLogs"]
+        ] == [(1, weight + 2.5, 8), (2, weight + 2.5, 8)]
+
+        sets_url = reverse("api:workout-sets", kwargs={"pk": workout.id})
+        payload = [{"exerciseOrder": 1, "order": 2, "weight": weight, "reps": 10}]
+        assert api_client.post(sets_url, payload, format="json").status_code == (
+            STATUS_OK
+        )
+
+        draft = api_client.get(url).json()
+        assert [
+            (s["weight"], s["reps"]) for s in draft["exerciseLogs"][0]["setLogs"]
+        ] == [(weight, max_reps), (weight, 11)]
+
+    def test_routine_suggestions_without_history(
+        self,
+        user: User,
+        api_client: APIClient,
+        routine: Routine,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:routine-suggestions", kwargs={"pk": routine.id})
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        routine_exercise = routine.routine_exercises.get()
+        assert [
+            (s["order"], s["weight"], s["reps"])
+            for s in response.json()["exerciseLogs"][0]["setLogs"]
+        ] == list(routine_exercise.routine_sets.values_list("order", "weight", "reps"))
+
+    def test_start_workout_of_another_user(
+        self,
+        api_client: APIClient,
+        routine: Routine,
+    ):
+        api_client.force_authenticate(user=UserFactory())
+        url = reverse("api:routine-start", kwargs={"pk": routine.id})
+
+        response = api_client.post(url)
+        assert response.status_code == STATUS_NOT_FOUND
+        assert not Workout.objects.exists()
+
+    def test_duplicate_routine(
+        self,
+        user: User,
+        api_client: APIClient,
+        routine: Routine,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:routine-duplicate", kwargs={"pk": routine.id})
+
+        response = api_client.post(url, {"name": "Copy"}, format="json")
+        assert response.status_code == STATUS_CREATED
+
+        routine_data = response.json()
+        assert routine_data["id"] != str(routine.id)
+        assert routine_data["name"] == "Copy"
+
+        copy = user.routines.get(id=routine_data["id"])
+        routine_exercise = routine.routine_exercises.get()
+        copy_exercise = copy.routine_exercises.get()
+        assert copy_exercise.id != routine_exercise.id
+        assert copy_exercise.exercise_id == routine_exercise.exercise_id
+        assert list(
+            copy_exercise.routine_sets.values_list("order", "weight", "reps"),
+        ) == list(routine_exercise.routine_sets.values_list("order", "weight", "reps"))
+
+    def test_generate_routine(self, user: User, api_client: APIClient):
+        sets_per_exercise = 3
+        bench_press = ExerciseFactory(
+            name="Bench Press",
+            primary_muscle_group=Exercise.MuscleGroups.CHEST,
+            other_muscles=[Exercise.MuscleGroups.TRICEPS],
+            exercise_type=Exercise.ExerciseTypes.WEIGHT_REPS,
+            equipment=Exercise.Equipments.BARBELL,
+        )
+        dips = ExerciseFactory(
+            name="Dips",
+            primary_muscle_group=Exercise.MuscleGroups.TRICEPS,
+            exercise_type=Exercise.ExerciseTypes.BODYWEIGHT_REPS,
+            equipment=Exercise.Equipments.NONE,
+        )
+        ExerciseFactory(
+            name="Cable Fly",
+            primary_muscle_group=Exercise.MuscleGroups.CHEST,
+            exercise_type=Exercise.ExerciseTypes.WEIGHT_REPS,
+            equipment=Exercise.Equipments.MACHINE,
+        )
+        ExerciseFactory(
+            name="Squat",
+            primary_muscle_group=Exercise.MuscleGroups.QUADRICEPS,
+            exercise_type=Exercise.ExerciseTypes.WEIGHT_REPS,
+            equipment=Exercise.Equipments.BARBELL,
+        )
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:routine-generate")
+
+        payload = {
+            "name": "Push",
+            "muscles": ["chest", "triceps"],
+            "equipment": ["barbell"],
+            "duration": 20,
+        }
+        response = api_client.post(url, payload, format="json")
+        assert response.status_code == STATUS_CREATED
+
+        routine_data = response.json()
+        assert routine_data["name"] == "Push"
+        assert [e["exerciseId"] for e in routine_data["routineExercises"]] == [
+            str(bench_press.id),
+            str(dips.id),
+        ]
+        routine = user.routines.get(id=routine_data["id"])
+        assert (
+            RoutineSet.objects.filter(routine_exercise__routine=routine).count()
+            == len(routine_data["routineExercises"]) * sets_per_exercise
+        )
+
+    def test_generate_routine_no_match(self, user: User, api_client: APIClient):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:routine-generate")
+
+        payload = {"name": "Neck", "muscles": ["neck"], "duration": 30}
+        response = api_client.post(url, payload, format="json")
+        assert response.status_code == STATUS_BAD_REQUEST
+
+    def test_reorder_routine(self, user: User, api_client: APIClient, routine: Routine):
+        second_exercise = RoutineExerciseFactory(routine=routine, order=2)
+        first_exercise = routine.routine_exercises.get(order=1)
+        set_ids = list(first_exercise.routine_sets.values_list("id", flat=True))
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:routine-reorder", kwargs={"pk": routine.id})
+
+        payload = {
+            "routineExercises": [
+                {"id": str(second_exercise.id)},
+                {
+                    "id": str(first_exercise.id),
+                    "routineSets": [str(pk) for pk in reversed(set_ids)],
+                },
+            ],
+        }
+        response = api_client.post(url, payload, format="json")
+        assert response.status_code == STATUS_OK
+
+        routine_data = response.json()
+        assert [e["id"] for e in routine_data["routineExercises"]] == [
+            str(second_exercise.id),
+            str(first_exercise.id),
+        ]
+        assert [
+            s["id"] for s in routine_data["routineExercises"][1]["routineSets"]
+        ] == [str(pk) for pk in reversed(set_ids)]
+
+    def test_reorder_routine_from_zero(
+        self,
+        user: User,
+        api_client: APIClient,
+        routine: Routine,
+    ):
+        routine_exercise = routine.routine_exercises.get()
+        first, second, third = routine_exercise.routine_sets.order_by("id")
+        for routine_set, order in [(first, 1), (second, 2), (third, 0)]:
+            RoutineSet.objects.filter(pk=routine_set.pk).update(order=order)
+        new_order = [second.id, third.id, first.id]
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:routine-reorder", kwargs={"pk": routine.id})
+        payload = {
+            "routineExercises": [
+                {
+                    "id": str(routine_exercise.id),
+                    "routineSets": [str(pk) for pk in new_order],
+                },
+            ],
+        }
+        response = api_client.post(url, payload, format="json")
+        assert response.status_code == STATUS_OK
+        routine_sets = routine_exercise.routine_sets.order_by("order")
+        assert list(routine_sets.values_list("id", flat=True)) == new_order
+
+    def test_reorder_routine_missing_exercise(
+        self,
+        user: User,
+        api_client: APIClient,
+        routine: Routine,
+    ):
+        RoutineExerciseFactory(routine=routine, order=2)
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:routine-reorder", kwargs={"pk": routine.id})
+
+        payload = {
+            "routineExercises": [{"id": str(routine.routine_exercises.first().id)}],
+        }
+        response = api_client.post(url, payload, format="json")
+        assert response.status_code == STATUS_BAD_REQUEST
+
 
 class TestExerciseViewSet:
     def test_get_exercise_list(
@@ -655,6 +1288,130 @@ class TestExerciseViewSet:
         assert exercise_data["smallImage"] is not None
         assert exercise_data["largeImage"] is not None
 
+    def test_get_exercise_alternatives(
+        self,
+        settings,
+        user: User,
+        api_client: APIClient,
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        chest = Exercise.MuscleGroups.CHEST
+        triceps = [Exercise.MuscleGroups.TRICEPS]
+        weight_reps = Exercise.ExerciseTypes.WEIGHT_REPS
+        bench_press = ExerciseFactory(
+            name="Bench Press",
+            primary_muscle_group=chest,
+            other_muscles=triceps,
+            exercise_type=weight_reps,
+            equipment=Exercise.Equipments.BARBELL,
+        )
+        dumbbell_press = ExerciseFactory(
+            name="Dumbbell Press",
+            primary_muscle_group=chest,
+            other_muscles=triceps,
+            exercise_type=weight_reps,
+            equipment=Exercise.Equipments.DUMBBELL,
+        )
+        push_up = ExerciseFactory(
+            name="Push Up",
+            primary_muscle_group=chest,
+            other_muscles=triceps,
+            exercise_type=Exercise.ExerciseTypes.BODYWEIGHT_REPS,
+            equipment=Exercise.Equipments.NONE,
+        )
+        ExerciseFactory(
+            name="Neck Curl",
+            primary_muscle_group=Exercise.MuscleGroups.NECK,
+            exercise_type=Exercise.ExerciseTypes.DURATION,
+            equipment=Exercise.Equipments.SUSPENSION,
+        )
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:exercise-alternatives", kwargs={"pk": bench_press.id})
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        alternatives = response.json()
+        assert [a["id"] for a in alternatives] == [
+            str(dumbbell_press.id),
+            str(push_up.id),
+        ]
+        assert alternatives[0]["name"] == dumbbell_press.name
+        assert alternatives[0]["similarity"] > alternatives[1]["similarity"]
+
+        response = api_client.get(url, {"equipment": Exercise.Equipments.NONE})
+        assert [a["id"] for a in response.json()] == [str(push_up.id)]
+
+    def test_get_exercise_alternatives_equipment_beyond_limit(
+        self,
+        settings,
+        monkeypatch,
+        user: User,
+        api_client: APIClient,
+    ):
+        monkeypatch.setattr("gymlog.gym.alternatives.ALTERNATIVES_LIMIT", 1)
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        chest = Exercise.MuscleGroups.CHEST
+        weight_reps = Exercise.ExerciseTypes.WEIGHT_REPS
+        bench_press = ExerciseFactory(
+            primary_muscle_group=chest,
+            other_muscles=[],
+            exercise_type=weight_reps,
+            equipment=Exercise.Equipments.BARBELL,
+        )
+        ExerciseFactory(
+            primary_muscle_group=chest,
+            other_muscles=[],
+            exercise_type=weight_reps,
+            equipment=Exercise.Equipments.BARBELL,
+        )
+        machine_press = ExerciseFactory(
+            primary_muscle_group=chest,
+            other_muscles=[],
+            exercise_type=weight_reps,
+            equipment=Exercise.Equipments.MACHINE,
+        )
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:exercise-alternatives", kwargs={"pk": bench_press.id})
+
+        response = api_client.get(url, {"equipment": Exercise.Equipments.MACHINE})
+        assert response.status_code == STATUS_OK
+        assert [a["id"] for a in response.json()] == [str(machine_press.id)]
+
+    def test_get_exercise_alternatives_queue_rebuild(
+        self,
+        monkeypatch,
+        user: User,
+        api_client: APIClient,
+        exercise: Exercise,
+    ):
+        queued = []
+        monkeypatch.setattr(
+            "gymlog.gym.tasks.rebuild_exercise_alternatives.delay",
+            lambda: queued.append(True),
+        )
+        api_client.force_authenticate(user=user)
+        url = reverse("api:exercise-alternatives", kwargs={"pk": exercise.id})
+
+        for _ in range(2):
+            response = api_client.get(url)
+            assert response.status_code == STATUS_OK
+            assert response.json() == []
+        assert queued == [True]
+
+    def test_get_exercise_alternatives_unknown_exercise(
+        self,
+        user: User,
+        api_client: APIClient,
+        exercise: Exercise,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:exercise-alternatives", kwargs={"pk": user.id})
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_NOT_FOUND
+
     def test_create_exercise(self, user: User, api_client: APIClient):
         api_client.force_authenticate(user=user)
         url = reverse("api:exercise-list")
@@ -735,3 +1492,290 @@ class TestExerciseViewSet:
 
         with pytest.raises(Exercise.DoesNotExist):
             exercise.refresh_from_db()
+
+
+class TestSetLogViewSet:
+    def test_get_set_log(self, user: User, api_client: APIClient, workout: Workout):
+        set_log = workout.exercise_logs.get(order=2).set_logs.get(order=3)
+
+        api_client.force_authenticate(user=user)
+        url = reverse(
+            "api:setlog-detail",
+            kwargs={"workout_uuid": workout.id, "exercise_order": 2, "order": 3},
+        )
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        assert response.json()["id"] == str(set_log.id)
+
+    def test_list_set_logs(self, user: User, api_client: APIClient, workout: Workout):
+        set_logs_count = 3
+
+        api_client.force_authenticate(user=user)
+        url = reverse(
+            "api:setlog-list",
+            kwargs={"workout_uuid": workout.id, "exercise_order": 1},
+        )
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+        assert [s["order"] for s in response.json()] == [1, 2, 3]
+        assert len(response.json()) == set_logs_count
+
+    def test_create_set_log(self, user: User, api_client: APIClient, workout: Workout):
+        new_reps = 8
+
+        api_client.force_authenticate(user=user)
+        url = reverse(
+            "api:setlog-list",
+            kwargs={"workout_uuid": workout.id, "exercise_order": 1},
+        )
+
+        response = api_client.post(
+            url,
+            {"order": 4, "weight": 80.0, "reps": new_reps},
+            format="json",
+        )
+        assert response.status_code == STATUS_CREATED
+
+        set_log = workout.exercise_logs.get(order=1).set_logs.get(order=4)
+        assert set_log.reps == new_reps
+
+    def test_update_set_log(self, user: User, api_client: APIClient, workout: Workout):
+        new_weight = 90.0
+
+        api_client.force_authenticate(user=user)
+        url = reverse(
+            "api:setlog-detail",
+            kwargs={"workout_uuid": workout.id, "exercise_order": 1, "order": 2},
+        )
+
+        response = api_client.patch(url, {"weight": new_weight}, format="json")
+        assert response.status_code == STATUS_OK
+
+        set_log = workout.exercise_logs.get(order=1).set_logs.get(order=2)
+        assert set_log.weight == pytest.approx(new_weight)
+
+    def test_set_log_duplicate_order(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse(
+            "api:setlog-list",
+            kwargs={"workout_uuid": workout.id, "exercise_order": 1},
+        )
+        payload = {"order": 2, "weight": 80.0, "reps": 8}
+        assert api_client.post(url, payload, format="json").status_code == (
+            STATUS_BAD_REQUEST
+        )
+
+        url = reverse(
+            "api:setlog-detail",
+            kwargs={"workout_uuid": workout.id, "exercise_order": 1, "order": 1},
+        )
+        response = api_client.patch(url, {"order": 3}, format="json")
+        assert response.status_code == STATUS_BAD_REQUEST
+        response = api_client.patch(url, {"order": 1, "reps": 9}, format="json")
+        assert response.status_code == STATUS_OK
+
+    def test_set_log_uppercase_workout_id(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse(
+            "api:setlog-detail",
+            kwargs={
+                "workout_uuid": str(workout.id).upper(),
+                "exercise_order": 1,
+                "order": 1,
+            },
+        )
+        assert api_client.get(url).status_code == STATUS_OK
+
+    def test_set_log_compact_columns(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=user)
+        url = reverse(
+            "api:setlog-detail",
+            kwargs={"workout_uuid": workout.id, "exercise_order": 1, "order": 2},
+        )
+
+        response = api_client.patch(url, {"weight": 102.5}, format="json")
+        assert response.status_code == STATUS_OK
+        assert response.json()["weight"] == pytest.approx(102.5)
+        assert response.json()["created"]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT weight FROM set_logs WHERE id = %s",
+                [response.json()["id"]],
+            )
+            assert cursor.fetchone() == (102_500,)
+
+    def test_get_set_log_of_another_user(
+        self,
+        api_client: APIClient,
+        workout: Workout,
+    ):
+        api_client.force_authenticate(user=UserFactory())
+        url = reverse(
+            "api:setlog-detail",
+            kwargs={"workout_uuid": workout.id, "exercise_order": 1, "order": 1},
+        )
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_NOT_FOUND
+
+
+class TestStatsViewSet:
+    def test_weekly(self, user: User, api_client: APIClient, workout: Workout):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:workout-detail", kwargs={"pk": workout.id})
+        exercise = ExerciseFactory(
+            name="Bench Press",
+            primary_muscle_group=Exercise.MuscleGroups.CHEST,
+            other_muscles=[Exercise.MuscleGroups.TRICEPS],
+        )
+        response = api_client.put(
+            url,
+            {
+                "routineId": str(workout.routine_id),
+                "exerciseLogs": [
+                    {
+                        "order": 1,
+                        "exerciseId": str(exercise.id),
+                        "setLogs": [
+                            {"order": 1, "weight": 80.0, "reps": 8},
+                            {"order": 2, "weight": 80.0, "reps": 6},
+                        ],
+                    },
+                ],
+            },
+            format="json",
+        )
+        assert response.status_code == STATUS_OK
+
+        url = reverse("api:stats-weekly")
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+
+        week = workout.created.date() - timedelta(days=workout.created.weekday())
+        assert response.json() == [
+            {
+                "week": week.isoformat(),
+                "muscleGroup": muscle_group,
+                "sets": 2,
+                "reps": 14,
+                "volume": 1120.0,
+            }
+            for muscle_group in ["chest", "triceps"]
+        ]
+
+        response = api_client.get(url, {"from": week + timedelta(weeks=1)})
+        assert response.status_code == STATUS_OK
+        assert response.json() == []
+
+        url = reverse("api:workout-detail", kwargs={"pk": workout.id})
+        assert api_client.delete(url).status_code == STATUS_NO_CONTENT
+        assert not user.weekly_summaries.exists()
+
+    def test_weekly_follows_set_writes(
+        self,
+        user: User,
+        api_client: APIClient,
+        workout: Workout,
+        django_capture_on_commit_callbacks,
+    ):
+        muscle_group = workout.exercise_logs.get(order=1).exercise.primary_muscle_group
+        api_client.force_authenticate(user=user)
+
+        def weekly_sets():
+            return WeeklySummary.objects.get(user=user, muscle_group=muscle_group).sets
+
+        url = reverse("api:workout-sets", kwargs={"pk": workout.id})
+        payload = [{"exerciseOrder": 1, "order": 4, "weight": 80.0, "reps": 5}]
+        with django_capture_on_commit_callbacks(execute=True):
+            assert api_client.post(url, payload, format="json").status_code == (
+                STATUS_OK
+            )
+        sets = weekly_sets()
+
+        url = reverse(
+            "api:setlog-detail",
+            kwargs={"workout_uuid": workout.id, "exercise_order": 1, "order": 4},
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            assert api_client.delete(url).status_code == STATUS_NO_CONTENT
+        assert weekly_sets() == sets - 1
+
+    def test_progress(self, user: User, api_client: APIClient, workout: Workout):
+        exercise_log = workout.exercise_logs.get(order=1)
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:stats-progress")
+
+        response = api_client.get(url, {"exercise": str(exercise_log.exercise_id)})
+        assert response.status_code == STATUS_OK
+
+        points = response.json()["points"]
+        assert len(points) == 1
+        assert points[0]["volume"] == pytest.approx(
+            sum(s.weight * s.reps for s in exercise_log.set_logs.all()),
+        )
+
+    def test_progress_invalid_formula(self, user: User, api_client: APIClient):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:stats-progress")
+
+        response = api_client.get(
+            url,
+            {"exercise": str(ExerciseFactory().id), "formula": "unknown"},
+        )
+        assert response.status_code == STATUS_BAD_REQUEST
+
+    def test_progress_points_too_few(self, user: User, api_client: APIClient):
+        api_client.force_authenticate(user=user)
+        url = reverse("api:stats-progress")
+
+        response = api_client.get(
+            url,
+            {"exercise": str(ExerciseFactory().id), "points": 2},
+        )
+        assert response.status_code == STATUS_BAD_REQUEST
+
+    def test_rest(self, user: User, api_client: APIClient, workout: Workout):
+        exercise_log = workout.exercise_logs.get(order=1)
+        for minutes, set_log in enumerate(exercise_log.set_logs.all()):
+            set_log.end = workout.created + timedelta(minutes=2 * minutes)
+            set_log.save()
+
+        api_client.force_authenticate(user=user)
+        url = reverse("api:stats-rest")
+
+        response = api_client.get(url)
+        assert response.status_code == STATUS_OK
+
+        statistics = response.json()
+        assert statistics["workouts"][0]["key"] == str(workout.id)
+        assert statistics["workouts"][0]["averageRest"] == "00:02:00"
+        assert statistics["exercises"][0]["key"] == str(exercise_log.exercise_id)
+        assert len(statistics["weeks"]) == 1
+
+        url = reverse("api:workout-finish", kwargs={"pk": workout.id})
+        response = api_client.post(url)
+        assert response.status_code == STATUS_OK
+        assert response.json()["averageRest"] == "00:02:00"
+
+        workout.refresh_from_db()
+        assert workout.average_rest == timedelta(minutes=2)
+        assert workout.density is not None
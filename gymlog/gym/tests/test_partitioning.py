@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import Workout
+from gymlog.users.models import User
+
+STATUS_OK = 200
+STATUS_NO_CONTENT = 204
+
+
+def _partitions_of(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT DISTINCT tableoid::regclass::text FROM {table}")  # noqa: S608
+        return sorted(name for (name,) in cursor.fetchall())
+
+
+def test_partition_logs(user: User, api_client: APIClient, workout: Workout):
+    set_logs_count = SetLog.objects.count()
+    month = workout.created.date().replace(day=1)
+
+    call_command("partition_logs", "convert")
+    assert _partitions_of("set_logs") == ["set_logs_default"]
+
+    call_command("partition_logs", "create", months=1)
+    # Run the foreign key checks a commit would.
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    assert _partitions_of("exercise_logs") == [f"exercise_logs_p{month:%Y_%m}"]
+    assert _partitions_of("set_logs") == [f"set_logs_p{month:%Y_%m}"]
+    assert SetLog.objects.count() == set_logs_count
+
+    api_client.force_authenticate(user=user)
+    url = reverse("api:workout-sets", kwargs={"pk": workout.id})
+    payload = [
+        {"exerciseOrder": 1, "order": 1, "weight": 80.0, "reps": 5},
+        {"exerciseOrder": 1, "order": 4, "weight": 80.0, "reps": 5},
+    ]
+    assert api_client.post(url, payload, format="json").status_code == STATUS_OK
+    assert SetLog.objects.count() == set_logs_count + 1
+
+    url = reverse("api:workout-detail", kwargs={"pk": workout.id})
+    assert api_client.delete(url).status_code == STATUS_NO_CONTENT
+    assert not SetLog.objects.exists()
+
+    call_command("partition_logs", "detach", before=month + timedelta(days=32))
+    assert f"set_logs_p{month:%Y_%m}" not in _partitions_of("set_logs")
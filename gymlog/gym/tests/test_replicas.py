@@ -0,0 +1,55 @@
+import pytest
+from django.conf import settings
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from gymlog.gym.models import Workout
+from gymlog.replicas import ReplicaMiddleware
+
+
+@pytest.fixture()
+def _replica(monkeypatch):
+    monkeypatch.setitem(settings.DATABASES, "replica", settings.DATABASES["default"])
+
+
+@pytest.fixture()
+def middleware():
+    def get_response(request):
+        return HttpResponse(router.db_for_read(Workout))
+
+    return ReplicaMiddleware(get_response)
+
+
+@pytest.mark.usefixtures("_replica")
+def test_safe_api_reads_use_replica(middleware):
+    request = RequestFactory().get("/api/workouts/", HTTP_AUTHORIZATION="Token a")
+
+    assert middleware(request).content == b"replica"
+    assert router.db_for_read(Workout) == "default"
+
+
+@pytest.mark.usefixtures("_replica")
+def test_other_reads_use_primary(middleware):
+    request = RequestFactory().get("/admin/", HTTP_AUTHORIZATION="Token a")
+
+    assert middleware(request).content == b"default"
+
+
+@pytest.mark.usefixtures("_replica")
+def test_writes_pin_to_primary(middleware):
+    factory = RequestFactory()
+
+    write = factory.post("/api/workouts/", HTTP_AUTHORIZATION="Token b")
+    assert middleware(write).content == b"default"
+
+    read = factory.get("/api/workouts/", HTTP_AUTHORIZATION="Token b")
+    assert middleware(read).content == b"default"
+    other = factory.get("/api/workouts/", HTTP_AUTHORIZATION="Token c")
+    assert middleware(other).content == b"replica"
+
+
+def test_reads_use_primary_without_replica(middleware):
+    request = RequestFactory().get("/api/workouts/", HTTP_AUTHORIZATION="Token a")
+
+    assert middleware(request).content == b"default"
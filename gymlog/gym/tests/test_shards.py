@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from gymlog.gym.models import Exercise
+from gymlog.gym.models import ExerciseLog
+from gymlog.gym.models import Routine
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import Workout
+from gymlog.gym.tests.factories import ExerciseFactory
+from gymlog.shards import shard_for
+from gymlog.users.models import User
+from gymlog.users.tests.factories import UserFactory
+
+STATUS_CREATED = 201
+SHARDS = ["shard_0", "shard_1"]
+
+pytestmark = pytest.mark.django_db(databases=["default", *SHARDS])
+
+
+@pytest.fixture(autouse=True)
+def _shards(settings):
+    settings.DATABASE_SHARDS = SHARDS
+
+
+@pytest.fixture()
+def users() -> dict[str, User]:
+    """One user on each shard."""
+    users = {}
+    while len(users) < len(SHARDS):
+        user = UserFactory()
+        users.setdefault(shard_for(user.pk), user)
+    return users
+
+
+def test_shard_for_is_stable():
+    user_id = "0190db2d-984c-7132-999f-c14433f25068"
+
+    assert shard_for(user_id) == shard_for(user_id)
+    assert {shard_for(UserFactory.build().pk) for _ in range(50)} == set(SHARDS)
+
+
+def test_global_rows_are_copied_to_shards(users):
+    exercise = ExerciseFactory()
+
+    for shard, user in users.items():
+        assert Exercise.objects.using(shard).filter(pk=exercise.pk).exists()
+        assert User.objects.using(shard).filter(pk=user.pk).exists()
+        other = next(u for s, u in users.items() if s != shard)
+        assert not User.objects.using(shard).filter(pk=other.pk).exists()
+
+    exercise.delete()
+    for shard in SHARDS:
+        assert not Exercise.objects.using(shard).filter(pk=exercise.pk).exists()
+
+
+def test_gym_data_lives_on_user_shard(users, api_client: APIClient):
+    exercise = ExerciseFactory()
+    payload = {
+        "name": "Push",
+        "routineExercises": [
+            {
+                "order": 1,
+                "exerciseId": str(exercise.id),
+                "routineSets": [{"order": 1, "weight": 50.0, "reps": 8}],
+            },
+        ],
+    }
+
+    for shard, user in users.items():
+        api_client.force_authenticate(user=user)
+        response = api_client.post(reverse("api:routine-list"), payload, format="json")
+        assert response.status_code == STATUS_CREATED
+        routine_id = response.json()["id"]
+        url = reverse("api:routine-start", kwargs={"pk": routine_id})
+        assert api_client.post(url).status_code == STATUS_CREATED
+
+        assert Routine.objects.using(shard).filter(pk=routine_id).exists()
+        workout = Workout.objects.using(shard).get(routine_id=routine_id)
+        assert workout.exercise_logs.get().set_logs.count() == 1
+
+        response = api_client.get(reverse("api:routine-list"))
+        assert [routine["id"] for routine in response.json()] == [routine_id]
+
+    assert not Routine.objects.using("default").exists()
+    assert not Workout.objects.using("default").exists()
+
+
+def test_rest_statistics_read_user_shard(users, api_client: APIClient):
+    exercise = ExerciseFactory()
+    for shard, user in users.items():
+        routine = Routine.objects.using(shard).create(user=user, name="Pull")
+        workout = Workout.objects.using(shard).create(user=user, routine=routine)
+        exercise_log = ExerciseLog.objects.using(shard).create(
+            workout=workout,
+            exercise=exercise,
+            order=1,
+        )
+        for order in range(1, 3):
+            SetLog.objects.using(shard).create(
+                exercise_log=exercise_log,
+                order=order,
+                weight=50.0,
+                reps=8,
+                end=workout.created + timedelta(minutes=2 * order),
+            )
+
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse("api:stats-rest"))
+        assert [w["key"] for w in response.json()["workouts"]] == [str(workout.id)]
+        assert response.json()["workouts"][0]["averageRest"] == "00:02:00"
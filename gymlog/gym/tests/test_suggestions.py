@@ -0,0 +1,48 @@
+import pytest
+
+from gymlog.gym.models import Exercise
+from gymlog.gym.suggestions import progress_sets
+
+WEIGHT_REPS = Exercise.ExerciseTypes.WEIGHT_REPS
+
+
+def test_double_progression_adds_reps():
+    sessions = [[(60.0, 10), (60.0, 12)], [(60.0, 9), (60.0, 11)]]
+
+    assert progress_sets(WEIGHT_REPS, sessions) == [(60.0, 11), (60.0, 12)]
+
+
+def test_double_progression_adds_weight():
+    sessions = [[(60.0, 12), (60.0, 12)]]
+
+    assert progress_sets(WEIGHT_REPS, sessions) == [(62.5, 8), (62.5, 8)]
+
+
+def test_double_progression_deloads_after_stall():
+    stalled = [(100.0, 9), (100.0, 8)]
+
+    assert progress_sets(WEIGHT_REPS, [stalled] * 3) == [(90.0, 9), (90.0, 8)]
+
+
+def test_assisted_progression_removes_assistance():
+    sessions = [[(5.0, 12)]]
+
+    assert progress_sets(Exercise.ExerciseTypes.ASSISTED_BODYWEIGHT, sessions) == [
+        (0.0, 6),
+    ]
+
+
+def test_progression_rules_override(settings):
+    settings.WORKOUT_PROGRESSION_RULES = {
+        WEIGHT_REPS: {"rule": "reps_progression", "max_reps": 5},
+    }
+
+    assert progress_sets(WEIGHT_REPS, [[(60.0, 5)]]) == [(60.0, 5)]
+
+
+def test_repeat():
+    sessions = [[(0.0, 1)]]
+
+    assert progress_sets(Exercise.ExerciseTypes.DURATION, sessions) == pytest.approx(
+        sessions[0],
+    )
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+import pytest
+from celery.result import EagerResult
+from django.core.cache import cache
+from django.utils import timezone
+
+from gymlog.gym import tasks
+from gymlog.gym.drafts import save_draft
+from gymlog.gym.models import ExerciseLog
+from gymlog.gym.models import Routine
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import WeeklySummary
+from gymlog.gym.models import Workout
+from gymlog.gym.summaries import week_of
+from gymlog.gym.tasks import delete_account
+from gymlog.gym.tasks import flush_workout_drafts
+from gymlog.gym.tasks import rebuild_weekly_summaries
+from gymlog.mixins import uuid7_floor
+from gymlog.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def test_flush_workout_drafts(settings, workout: Workout):
+    new_volume = 500.0
+    save_draft(
+        workout,
+        {
+            "duration": "00:10:00",
+            "volume": new_volume,
+            "routine_id": str(workout.routine_id),
+            "exercise_logs": [],
+        },
+    )
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    task_result = flush_workout_drafts.delay()
+    assert isinstance(task_result, EagerResult)
+    assert task_result.result == 1
+
+    workout.refresh_from_db()
+    assert workout.volume == pytest.approx(new_volume)
+    assert not workout.exercise_logs.exists()
+
+    # Nothing changed since the last flush.
+    assert flush_workout_drafts.delay().result == 0
+
+
+def test_save_draft_counter_expired(monkeypatch, workout: Workout):
+    incr = cache.incr
+
+    def expire_then_incr(key, *args, **kwargs):
+        # The counter expires right after it was found to exist.
+        monkeypatch.setattr(cache, "incr", incr)
+        cache.delete(key)
+        return incr(key, *args, **kwargs)
+
+    save_draft(workout, {"exercise_logs": []})
+    monkeypatch.setattr(cache, "incr", expire_then_incr)
+
+    assert save_draft(workout, {"exercise_logs": []}) == 1
+
+
+def test_flush_drafts_of_old_workouts(settings, user: User, routine: Routine):
+    started = timezone.now() - timedelta(days=30)
+    workout = Workout.objects.create(
+        pk=uuid7_floor(started),
+        user=user,
+        routine=routine,
+        created=started,
+    )
+    new_volume = 500.0
+    save_draft(
+        workout,
+        {
+            "duration": "00:10:00",
+            "volume": new_volume,
+            "routine_id": str(routine.id),
+            "exercise_logs": [],
+        },
+    )
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    assert flush_workout_drafts.delay().result == 1
+    workout.refresh_from_db()
+    assert workout.volume == pytest.approx(new_volume)
+
+
+def test_rebuild_weekly_summaries(settings, workout: Workout):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    task_result = rebuild_weekly_summaries.delay()
+    assert isinstance(task_result, EagerResult)
+    assert task_result.result == 1
+
+    sets_count = 3
+    for exercise_log in workout.exercise_logs.select_related("exercise"):
+        summary = WeeklySummary.objects.get(
+            user=workout.user,
+            week=week_of(workout.created),
+            muscle_group=exercise_log.exercise.primary_muscle_group,
+        )
+        assert summary.sets >= sets_count
+
+
+def test_delete_account(settings, monkeypatch, workout: Workout):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    monkeypatch.setattr(tasks, "ACCOUNT_DELETE_BATCH_SIZE", 1)
+    user = workout.user
+    Workout.objects.create(user=user, routine=workout.routine)
+    exercise_log_ids = list(workout.exercise_logs.values_list("pk", flat=True))
+
+    assert delete_account.delay(user.pk).result is False
+
+    assert not Workout.objects.filter(user=user).exists()
+    assert not Routine.objects.filter(user=user).exists()
+    assert not ExerciseLog.objects.filter(pk__in=exercise_log_ids).exists()
+    assert not SetLog.objects.filter(exercise_log_id__in=exercise_log_ids).exists()
+    assert not User.objects.filter(pk=user.pk).exists()
+
+
+def test_workout_delete_is_one_query(django_assert_num_queries, workout: Workout):
+    with django_assert_num_queries(1):
+        Workout.objects.filter(pk=workout.pk).delete()
+    assert not SetLog.objects.filter(exercise_log__workout_id=workout.pk).exists()
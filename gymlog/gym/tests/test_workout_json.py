@@ -0,0 +1,86 @@
+import json
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import Workout
+from gymlog.users.models import User
+from gymlog.users.tests.factories import UserFactory
+
+STATUS_OK = 200
+STATUS_NOT_FOUND = 404
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def workouts(user: User, workout: Workout) -> list[Workout]:
+    """The ``workout`` fixture plus one with the edge cases of each format."""
+    Workout.objects.filter(pk=workout.pk).update(
+        duration=timedelta(days=1, hours=2, seconds=3, microseconds=45),
+        average_rest=timedelta(minutes=1, seconds=30, microseconds=500000),
+        volume=1500.0,
+        density=171.4,
+        end=datetime(2024, 7, 24, 17, 0, tzinfo=UTC),
+    )
+    SetLog.objects.filter(exercise_log__workout=workout, order=1).update(weight=62.5)
+    SetLog.objects.filter(exercise_log__workout=workout, order=2).update(
+        weight=0.1,
+        end=datetime(2024, 7, 24, 16, 59, 45, 328608, tzinfo=UTC),
+    )
+    empty = Workout.objects.create(user=user, routine=None, duration=None)
+    return [workout, empty]
+
+
+@pytest.mark.parametrize("action", ["list", "detail"])
+def test_matches_serializer(
+    settings,
+    user: User,
+    api_client: APIClient,
+    workouts: list[Workout],
+    action: str,
+):
+    api_client.force_authenticate(user=user)
+    if action == "list":
+        url = reverse("api:workout-list")
+    else:
+        url = reverse("api:workout-detail", kwargs={"pk": workouts[0].pk})
+
+    settings.WORKOUT_JSON_AGGREGATION = False
+    expected = api_client.get(url).content
+    settings.WORKOUT_JSON_AGGREGATION = True
+    response = api_client.get(url)
+
+    assert response.status_code == STATUS_OK
+    assert response["Content-Type"] == "application/json"
+    # Whole numbers are read as text so that ``100`` does not equal ``100.0``.
+    assert json.loads(response.content, parse_int=str) == json.loads(
+        expected,
+        parse_int=str,
+    )
+
+
+def test_other_users_workout_not_found(
+    settings,
+    api_client: APIClient,
+    workout: Workout,
+):
+    settings.WORKOUT_JSON_AGGREGATION = True
+    api_client.force_authenticate(user=UserFactory())
+
+    url = reverse("api:workout-detail", kwargs={"pk": workout.pk})
+    assert api_client.get(url).status_code == STATUS_NOT_FOUND
+    assert api_client.get(reverse("api:workout-list")).content == b"[]"
+
+
+def test_malformed_id_not_found(settings, user: User, api_client: APIClient):
+    settings.WORKOUT_JSON_AGGREGATION = True
+    api_client.force_authenticate(user=user)
+
+    url = reverse("api:workout-detail", kwargs={"pk": "abc"})
+    assert api_client.get(url).status_code == STATUS_NOT_FOUND
@@ -0,0 +1,115 @@
+"""Rest-interval and density statistics derived from ``SetLog.end``.
+
+The rest before a set is the time since the previous set of the same workout
+ended, taken with ``LAG()`` over the sets ordered by ``end``. Per-workout,
+per-exercise and per-week figures come out of one query through
+``GROUPING SETS``. Density is volume lifted per minute of rest.
+
+``finish_workout`` stores the per-workout figures, together with the
+workout's end and duration, so later reads never scan set logs.
+"""
+
+from datetime import timedelta
+
+from django.db import connections
+from django.db.models import Max
+from django.db.models import Min
+
+from gymlog.gym.models import SetLog
+from gymlog.gym.models import Workout
+from gymlog.shards import current_database
+
+_REST_STATISTICS_SQL = """
+WITH rests AS (
+    SELECT
+        w.id AS workout_id,
+        el.exercise_id,
+        date_trunc('week', w.created)::date AS week,
+        -- Weights are stored in grams.
+        (s.weight * s.reps)::double precision / 1000 AS volume,
+        EXTRACT(EPOCH FROM s."end" - LAG(s."end") OVER (
+            PARTITION BY w.id ORDER BY s."end"
+        )) AS rest
+    FROM set_logs s
+    JOIN exercise_logs el ON el.id = s.exercise_log_id
+    JOIN workouts w ON w.id = el.workout_id
+    WHERE w.user_id = %(user_id)s
+      AND s."end" IS NOT NULL
+      AND (%(workout_id)s::uuid IS NULL OR w.id = %(workout_id)s::uuid)
+      AND (%(start)s::date IS NULL OR w.created >= %(start)s::date)
+      AND (%(end)s::date IS NULL OR w.created < %(end)s::date + 1)
+)
+SELECT
+    GROUPING(workout_id, exercise_id, week),
+    COALESCE(workout_id::text, exercise_id::text, week::text),
+    COUNT(*),
+    AVG(rest),
+    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY rest),
+    MAX(rest),
+    SUM(volume) / NULLIF(SUM(rest) / 60, 0)
+FROM rests
+GROUP BY GROUPING SETS ((workout_id), (exercise_id), (week))
+"""
+
+# GROUPING() sets a bit for every column the row is not grouped on.
+_GROUPINGS = {0b011: "workouts", 0b101: "exercises", 0b110: "weeks"}
+
+
+def _seconds(value):
+    return None if value is None else timedelta(seconds=float(value))
+
+
+def rest_statistics(user_id, *, workout_id=None, start=None, end=None) -> dict:
+    """Rest and density per workout, exercise and week for one user."""
+    with connections[current_database()].cursor() as cursor:
+        cursor.execute(
+            _REST_STATISTICS_SQL,
+            {
+                "user_id": user_id,
+                "workout_id": workout_id,
+                "start": start,
+                "end": end,
+            },
+        )
+        rows = cursor.fetchall()
+
+    statistics = {"workouts": [], "exercises": [], "weeks": []}
+    for grouping, key, sets, average, median, longest, density in rows:
+        statistics[_GROUPINGS[grouping]].append(
+            {
+                "key": key,
+                "sets": sets,
+                "average_rest": _seconds(average),
+                "median_rest": _seconds(median),
+                "longest_rest": _seconds(longest),
+                "density": density,
+            },
+        )
+    return statistics
+
+
+def finish_workout(workout: Workout) -> None:
+    """Persist the timing figures of ``workout`` derived from its set logs.
+
+    Missing ``end`` and ``duration`` are filled from the first and last
+    ``SetLog.end``; values sent by the client are kept.
+    """
+    span = SetLog.objects.filter(exercise_log__workout=workout).aggregate(
+        first=Min("end"),
+        last=Max("end"),
+    )
+    if workout.end is None:
+        workout.end = span["last"]
+    if workout.duration is None and span["first"] is not None:
+        workout.duration = span["last"] - span["first"]
+
+    statistics = rest_statistics(workout.user_id, workout_id=workout.id)["workouts"]
+    workout.average_rest = statistics[0]["average_rest"] if statistics else None
+    workout.density = statistics[0]["density"] if statistics else None
+
+    Workout.objects.filter(pk=workout.pk).update(
+        end=workout.end,
+        duration=workout.duration,
+        average_rest=workout.average_rest,
+        density=workout.density,
+    )
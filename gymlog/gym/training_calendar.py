@@ -0,0 +1,85 @@
+"""Training days and streaks for the calendar widgets.
+
+Results are cached per user under a version number that every workout write
+bumps, so stale entries are never read and simply expire.
+"""
+
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from gymlog.gym.models import Workout
+
+
+def _version_key(user_id) -> str:
+    return f"gym:calendar-version:{user_id}"
+
+
+def invalidate_calendar(user_id) -> None:
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), 1, None)
+
+
+def _day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _days(user_id, start=None, end=None) -> list[dict]:
+    # Filters and reads only (user, created, volume), all of which are in
+    # workouts_user_created_idx.
+    workouts = Workout.objects.filter(user_id=user_id)
+    if start:
+        workouts = workouts.filter(created__gte=_day_start(start))
+    if end:
+        workouts = workouts.filter(created__lt=_day_start(end + timedelta(days=1)))
+    return list(
+        workouts.order_by()
+        .values(date=TruncDate("created"))
+        .annotate(workouts=Count("*"), volume=Sum("volume"))
+        .order_by("date"),
+    )
+
+
+def _streaks(days) -> tuple[int, int]:
+    """Current and longest run of consecutive training days."""
+    longest = current = 0
+    previous = None
+    for day in days:
+        current = current + 1 if previous == day - timedelta(days=1) else 1
+        longest = max(longest, current)
+        previous = day
+
+    today = timezone.localdate()
+    if previous is None or previous < today - timedelta(days=1):
+        current = 0
+    return current, longest
+
+
+def training_calendar(user_id, start=None, end=None) -> dict:
+    """Per-day workout counts and volume in the range, plus streaks."""
+    version = cache.get_or_set(_version_key(user_id), 1, None)
+    key = f"gym:calendar:{user_id}:{start}:{end}"
+    calendar = cache.get(key, version=version)
+    if calendar is None:
+        days = _days(user_id, start, end)
+        if start or end:
+            all_days = [row["date"] for row in _days(user_id)]
+        else:
+            all_days = [row["date"] for row in days]
+        current_streak, longest_streak = _streaks(all_days)
+        calendar = {
+            "days": days,
+            "current_streak": current_streak,
+            "longest_streak": longest_streak,
+        }
+        cache.set(key, calendar, version=version)
+    return calendar
@@ -0,0 +1,122 @@
+"""Workouts rendered to JSON by Postgres.
+
+``WorkoutSerializer`` builds a model instance and a set of field objects for
+every exercise log and set before anything is rendered. Here the same nested
+document, keys already camelCased, comes out of one query built with
+``json_build_object`` and ``json_agg``, and the text is handed to the response
+as it is. Values are formatted the way the serializer formats them:
+timestamps in UTC with a trailing ``Z``, durations as ``[D ]HH:MM:SS[.ffffff]``,
+weights in kilograms and floats with a fractional part even when whole.
+``created`` of logs and sets is read from their UUIDv7 keys, as the models do.
+
+Turned on by ``WORKOUT_JSON_AGGREGATION``.
+"""
+
+from django.db import connections
+from django.db.models import QuerySet
+
+# The fragments below go into queries with parameters, hence ``%%``.
+
+
+def _timestamp(column: str) -> str:
+    # isoformat() leaves out the fraction when it is zero.
+    return f"""CASE WHEN {column} IS NOT NULL THEN
+        to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS')
+        || CASE WHEN EXTRACT(MICROSECONDS FROM {column}) %% 1000000 = 0 THEN ''
+            ELSE to_char({column} AT TIME ZONE 'UTC', '.US') END
+        || 'Z' END"""
+
+
+def _uuid7_timestamp(column: str) -> str:
+    milliseconds = (
+        f"('x' || left(replace({column}::text, '-', ''), 12))::bit(48)::bigint"
+    )
+    return _timestamp(f"(timestamptz 'epoch' + {milliseconds} * interval '1 ms')")
+
+
+def _duration(column: str) -> str:
+    # Same layout as django.utils.duration.duration_string().
+    us = f"(EXTRACT(EPOCH FROM {column}) * 1000000)::bigint"
+    return f"""CASE WHEN {column} IS NOT NULL THEN
+        CASE WHEN {us} >= 86400000000 THEN ({us} / 86400000000)::text || ' '
+            ELSE '' END
+        || lpad(({us} / 3600000000 %% 24)::text, 2, '0')
+        || ':' || lpad(({us} / 60000000 %% 60)::text, 2, '0')
+        || ':' || lpad(({us} / 1000000 %% 60)::text, 2, '0')
+        || CASE WHEN {us} %% 1000000 = 0 THEN ''
+            ELSE '.' || lpad(({us} %% 1000000)::text, 6, '0') END
+        END"""
+
+
+def _float(column: str) -> str:
+    # Postgres prints a whole double without ``.0``; Python keeps it. Both
+    # switch to exponents for large numbers, so those are left as they are.
+    return f"""CASE WHEN {column} = trunc({column}) AND abs({column}) < 1e15
+        THEN ({column}::text || '.0')::json ELSE to_json({column}) END"""
+
+
+# ``performed`` repeats the parent's creation time; matching on it lets the
+# planner skip partitions and use the (parent, performed, order) indexes.
+_WORKOUT_SQL = f"""
+SELECT json_build_object(
+    'id', w.id,
+    'created', {_timestamp("w.created")},
+    'modified', {_timestamp("w.modified")},
+    'end', {_timestamp('w."end"')},
+    'duration', {_duration("w.duration")},
+    'volume', {_float("w.volume")},
+    'averageRest', {_duration("w.average_rest")},
+    'density', {_float("w.density")},
+    'routineId', w.routine_id,
+    'exerciseLogs', COALESCE((
+        SELECT json_agg(json_build_object(
+            'id', el.id,
+            'created', {_uuid7_timestamp("el.id")},
+            'modified', {_timestamp("el.modified")},
+            'order', el."order",
+            'exerciseId', el.exercise_id,
+            'setLogs', COALESCE((
+                SELECT json_agg(json_build_object(
+                    'id', s.id,
+                    'created', {_uuid7_timestamp("s.id")},
+                    'modified', {_timestamp("s.modified")},
+                    'order', s."order",
+                    'weight', {_float("(s.weight::double precision / 1000)")},
+                    'reps', s.reps,
+                    'end', {_timestamp('s."end"')}
+                ) ORDER BY s."order")
+                FROM set_logs s
+                WHERE s.exercise_log_id = el.id AND s.performed = el.performed
+            ), '[]')
+        ) ORDER BY el."order")
+        FROM exercise_logs el
+        WHERE el.workout_id = w.id AND el.performed = w.created
+    ), '[]')) AS document, w.created
+FROM workouts w
+WHERE w.id IN ({{workouts}})
+"""  # noqa: S608
+
+_LIST_SQL = f"""
+SELECT COALESCE(json_agg(document ORDER BY created DESC), '[]')::text
+FROM ({_WORKOUT_SQL}) documents
+"""
+
+_DETAIL_SQL = f"SELECT document::text FROM ({_WORKOUT_SQL}) documents"  # noqa: S608
+
+
+def _fetch(sql: str, workouts: QuerySet) -> str | None:
+    subquery, params = workouts.values("pk").query.sql_with_params()
+    with connections[workouts.db].cursor() as cursor:
+        cursor.execute(sql.format(workouts=subquery), tuple(params))
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def workout_list_json(workouts: QuerySet) -> str:
+    """A JSON array of ``workouts``, newest first."""
+    return _fetch(_LIST_SQL, workouts.order_by())
+
+
+def workout_json(workouts: QuerySet) -> str | None:
+    """The JSON document of the only workout in ``workouts``, if there is one."""
+    return _fetch(_DETAIL_SQL, workouts)
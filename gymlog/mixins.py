@@ -1,3 +1,7 @@
+from datetime import UTC
+from datetime import datetime
+from uuid import UUID
+
 import uuid_utils as uuid
 from django.contrib import admin
 from django.db.models import Model
@@ -10,6 +14,22 @@ def generate_uuid7():
     return str(uuid.uuid7())
 
 
+def uuid7_floor(moment: datetime) -> UUID:
+    """Smallest UUIDv7 that can be generated at ``moment``.
+
+    Primary keys are time-ordered, so ``pk__gte=uuid7_floor(moment)`` selects
+    rows created since ``moment`` with a range scan on the primary key index.
+    """
+    timestamp_ms = int(moment.timestamp() * 1000)
+    return UUID(int=(timestamp_ms << 80) | (0x7 << 76))
+
+
+def uuid7_timestamp(value) -> datetime:
+    """The moment, to the millisecond, at which a UUIDv7 was generated."""
+    timestamp_ms = UUID(str(value)).int >> 80
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=UTC)
+
+
 class UUIDModel(Model):
     id = UUIDField(primary_key=True, default=generate_uuid7, editable=False)
 
@@ -0,0 +1,89 @@
+"""Read-replica routing with read-your-writes stickiness.
+
+``ReplicaMiddleware`` lets safe API requests read the gym and users apps
+from the ``replica`` database alias. A client that has just written is
+pinned to the primary for ``DATABASE_REPLICA_PIN_SECONDS``, long enough to
+cover replication lag. The pin lives in the cache and is keyed by the
+request's credentials, so it works for both session and token clients.
+"""
+
+import hashlib
+import re
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+
+REPLICA_DB_ALIAS = "replica"
+ROUTED_APP_LABELS = {"gym", "users"}
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def _pin_key(request) -> str | None:
+    credentials = request.headers.get("Authorization") or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME,
+    )
+    if not credentials:
+        return None
+    digest = hashlib.sha256(credentials.encode()).hexdigest()
+    return f"db:primary-pin:{digest}"
+
+
+def is_pinned(request) -> bool:
+    key = _pin_key(request)
+    return key is not None and cache.get(key, default=False)
+
+
+def pin_to_primary(request) -> None:
+    key = _pin_key(request)
+    if key is not None:
+        cache.set(key, value=True, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.urls_regex = re.compile(settings.DATABASE_REPLICA_URLS_REGEX)
+
+    def __call__(self, request):
+        use_replica = (
+            request.method in SAFE_METHODS
+            and self.urls_regex.match(request.path_info) is not None
+            and not is_pinned(request)
+        )
+        token = _use_replica.set(use_replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+        if request.method not in SAFE_METHODS:
+            pin_to_primary(request)
+        return response
+
+
+class PrimaryReplicaRouter:
+    """Send reads to the replica only where ``ReplicaMiddleware`` allows it."""
+
+    def db_for_read(self, model, **hints):
+        if (
+            _use_replica.get()
+            and model._meta.app_label in ROUTED_APP_LABELS  # noqa: SLF001
+            and REPLICA_DB_ALIAS in settings.DATABASES
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,169 @@
+"""User-hash sharding of gym data across several databases.
+
+With ``DATABASE_SHARDS`` set, routines, workouts and everything that hangs off
+them live on one shard per user, picked by a stable hash of the user's id. The
+exercise catalog and users stay on ``default`` and are copied to the shards, so
+foreign keys and joins to them keep working inside a shard.
+
+Queries find their shard from the instance they are made through or, for
+plain ``Model.objects`` queries, from the user set by ``UserShardMixin`` or
+``use_database``. Without either they fall back to ``default``.
+"""
+
+import functools
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+
+SHARD_ALIAS_PREFIX = "shard_"
+SHARDED_MODELS = frozenset(
+    {
+        "gym.routine",
+        "gym.routineexercise",
+        "gym.routineset",
+        "gym.workout",
+        "gym.exerciselog",
+        "gym.setlog",
+        "gym.lastperformance",
+        "gym.weeklysummary",
+        "gym.workoutarchive",
+    },
+)
+GLOBAL_MODELS = frozenset({"gym.exercise", settings.AUTH_USER_MODEL.lower()})
+
+_database = ContextVar("database", default=None)
+
+
+def shard_for(user_id) -> str:
+    """The shard alias of ``user_id``; stable across processes and restarts."""
+    digest = hashlib.sha256(str(user_id).encode()).digest()
+    shards = settings.DATABASE_SHARDS
+    return shards[int.from_bytes(digest[:8]) % len(shards)]
+
+
+def database_for(user_id) -> str:
+    return shard_for(user_id) if settings.DATABASE_SHARDS else DEFAULT_DB_ALIAS
+
+
+def databases() -> list[str]:
+    """Every database holding gym data."""
+    return list(settings.DATABASE_SHARDS) or [DEFAULT_DB_ALIAS]
+
+
+def current_database() -> str:
+    return _database.get() or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def use_database(alias):
+    token = _database.set(alias)
+    try:
+        yield alias
+    finally:
+        _database.reset(token)
+
+
+def atomic(func):
+    """``transaction.atomic`` on the current user's database."""
+
+    @functools.wraps(func)
+    def inner(*args, **kwargs):
+        with transaction.atomic(using=current_database()):
+            return func(*args, **kwargs)
+
+    return inner
+
+
+def copy_to_shards(instance) -> None:
+    """Copy a global row to the shards that reference it."""
+    if not settings.DATABASE_SHARDS:
+        return
+    model = type(instance)
+    values = {
+        field.attname: getattr(instance, field.attname)
+        for field in model._meta.concrete_fields  # noqa: SLF001
+        if not field.primary_key
+    }
+    for alias in _shards_of(instance):
+        model._base_manager.using(alias).update_or_create(  # noqa: SLF001
+            pk=instance.pk,
+            defaults=values,
+        )
+
+
+def delete_from_shards(instance) -> None:
+    if not settings.DATABASE_SHARDS:
+        return
+    model = type(instance)
+    for alias in _shards_of(instance):
+        model._base_manager.using(alias).filter(pk=instance.pk).delete()  # noqa: SLF001
+
+
+def _shards_of(instance) -> list[str]:
+    # A user's rows only ever reference them from their own shard.
+    if instance._meta.label_lower == settings.AUTH_USER_MODEL.lower():  # noqa: SLF001
+        return [shard_for(instance.pk)]
+    return list(settings.DATABASE_SHARDS)
+
+
+class UserShardMixin:
+    """Run a viewset's queries on the requesting user's shard."""
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _database.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _database.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication runs here, so the user is only known from now on.
+        super().initial(request, *args, **kwargs)
+        if request.user.is_authenticated:
+            _database.set(database_for(request.user.pk))
+
+
+class UserShardRouter:
+    """Place sharded models on their user's shard.
+
+    Returns ``None`` for everything else, leaving it to the next router.
+    """
+
+    def _database(self, model, **hints):
+        if (
+            not settings.DATABASE_SHARDS
+            or model._meta.label_lower not in SHARDED_MODELS  # noqa: SLF001
+        ):
+            return None
+        instance = hints.get("instance")
+        if instance is not None:
+            label = instance._meta.label_lower  # noqa: SLF001
+            if label in SHARDED_MODELS and instance._state.db:  # noqa: SLF001
+                return instance._state.db  # noqa: SLF001
+            if label == settings.AUTH_USER_MODEL.lower():
+                return shard_for(instance.pk)
+            if getattr(instance, "user_id", None) is not None:
+                return shard_for(instance.user_id)
+        return _database.get()
+
+    db_for_read = _database
+    db_for_write = _database
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not settings.DATABASE_SHARDS:
+            return None
+        labels = {obj1._meta.label_lower, obj2._meta.label_lower}  # noqa: SLF001
+        if labels & GLOBAL_MODELS:
+            return True
+        return obj1._state.db == obj2._state.db  # noqa: SLF001
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Shards are migrated even before routing is turned on for them, so
+        # one can be added ahead of time.
+        if db.startswith(SHARD_ALIAS_PREFIX):
+            return True
+        return None
@@ -1,5 +1,7 @@
+from functools import partial
 from uuid import UUID
 
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.mixins import ListModelMixin
@@ -8,6 +10,7 @@ from rest_framework.mixins import UpdateModelMixin
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from gymlog.gym.tasks import delete_account
 from gymlog.users.models import User
 
 from .serializers import UserSerializer
@@ -22,8 +25,16 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
         assert isinstance(self.request.user.id, (str, UUID))
         return self.queryset.filter(id=self.request.user.id)
 
-    @action(detail=False, methods=["get", "put"])
+    @action(detail=False, methods=["get", "put", "delete"])
     def me(self, request):
+        if request.method == "DELETE":
+            # Sign the user out everywhere now; a heavy account's data can
+            # take several tasks to delete.
+            request.user.is_active = False
+            request.user.save(update_fields=["is_active"])
+            transaction.on_commit(partial(delete_account.delay, request.user.id))
+            return Response(status=status.HTTP_202_ACCEPTED)
+
         if request.method == "PUT":
             s = self.get_serializer(request.user, data=request.data, partial=True)
             s.is_valid(raise_exception=True)
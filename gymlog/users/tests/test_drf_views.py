@@ -1,4 +1,5 @@
 import pytest
+from rest_framework import status
 from rest_framework.test import APIRequestFactory
 
 from gymlog.users.api.views import UserViewSet
@@ -37,3 +38,24 @@ class TestUserViewSet:
             "profile_picture": None,
             "private_profile": True,
         }
+
+    def test_me_delete(
+        self,
+        settings,
+        user: User,
+        api_rf: APIRequestFactory,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        view = UserViewSet()
+        request = api_rf.delete("/fake-url/")
+        request.user = user
+
+        view.request = request
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            response = view.me(request)  # type: ignore[call-arg, arg-type, misc]
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert len(callbacks) == 1
+        assert not User.objects.filter(pk=user.pk).exists()